@@ -0,0 +1,65 @@
+"""Run the benchmark suite and write the results as JSON.
+
+Run with `python -m benchmarks [--output results.json] [--baseline previous.json] [--quick]`. With `--baseline` the
+run times are compared with the results of a previous run (like the one of the previous version).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+from dataclasses import asdict
+from datetime import UTC, datetime
+from pathlib import Path
+
+from .suite import cases, measure
+
+NUMBER = 200
+QUICK_NUMBER = 20
+
+
+def _key(result: dict[str, object]) -> tuple[object, ...]:
+    return result["axis"], result["value"], result["variant"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    parser.add_argument("--baseline", type=Path, help="results of a previous run to compare with")
+    parser.add_argument("--quick", action="store_true", help="fewer rounds, for a smoke check")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        baseline = {_key(r): r for r in json.loads(args.baseline.read_text())["results"]}
+
+    print(
+        f"{'axis':>16} {'value':>6} {'variant':>13} {'decorate (us)':>14} {'run (us)':>10} {'reset (us)':>11}"
+        f" {'memory (KiB)':>13} {'vs baseline':>12}",
+    )
+    results = []
+    for case in cases():
+        result = asdict(measure(case, number=QUICK_NUMBER if args.quick else NUMBER))
+        results.append(result)
+
+        reset = "-" if result["reset_us"] is None else f"{result['reset_us']:.1f}"
+        previous = baseline.get(_key(result))
+        ratio = f"{result['run_us'] / previous['run_us']:.2f}x" if previous else "-"
+        print(
+            f"{result['axis']:>16} {result['value']:>6} {result['variant']:>13} {result['decorate_us']:>14.1f}"
+            f" {result['run_us']:>10.1f} {reset:>11} {result['memory_bytes'] / 1024:>13.1f} {ratio:>12}",
+        )
+
+    report = {
+        "created": datetime.now(tz=UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
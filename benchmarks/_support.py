@@ -0,0 +1,32 @@
+"""Shared helpers for the benchmarks."""
+
+from __future__ import annotations
+
+import sys
+import timeit
+import types
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+MODULE_NAME = "benchmarks._generated"
+
+
+def make_module(size: int) -> list[str]:
+    """Register a module with `size` patchable attributes and return their names."""
+    module = sys.modules.get(MODULE_NAME)
+    if module is None:
+        module = sys.modules[MODULE_NAME] = types.ModuleType(MODULE_NAME)
+
+    names = [f"dep_{i}" for i in range(size)]
+    for name in names:
+        if not hasattr(module, name):
+            setattr(module, name, types.SimpleNamespace(value=name))
+
+    return names
+
+
+def best_of(func: Callable[[], object], *, number: int, repeat: int = 5) -> float:
+    """Return the best time of `repeat` rounds in microseconds per call."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1_000_000
@@ -0,0 +1,50 @@
+"""Compare the per-test cost of plain children, cached autospec and `create_autospec` on every run.
+
+`cold` is the first run paying for `create_autospec`, `warm` the following runs recycling the cached children. The
+targets are two modules and a function.
+
+Run with `python -m benchmarks.bench_autospec`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from unittest.mock import create_autospec, patch
+
+from src.ykcom import ykcom
+
+from ._support import best_of
+
+TARGETS = {"json": json, "os": os, "dumps": json.dumps}
+NUMBER = 200
+
+
+def main() -> None:
+    print(f"{'target':>8} {'plain (us)':>11} {'cold (us)':>10} {'warm (us)':>10} {'create_autospec (us)':>21}")
+    for name, module in TARGETS.items():
+        # The target is patched on this module, all the modules share the cached spec of the same object
+        globals()[name] = module
+
+        def run(*, autospec: bool, name: str = name) -> None:
+            with ykcom(__name__, name, autospec=autospec):
+                pass
+
+        def run_create_autospec(name: str = name, module: object = module) -> None:
+            with patch(f"{__name__}.{name}", create_autospec(module)):
+                pass
+
+        start = time.perf_counter()
+        run(autospec=True)
+        cold = (time.perf_counter() - start) * 1_000_000
+
+        print(
+            f"{name:>8} {best_of(lambda: run(autospec=False), number=NUMBER):>11.1f} {cold:>10.1f}"
+            f" {best_of(lambda: run(autospec=True), number=NUMBER):>10.1f}"
+            f" {best_of(run_create_autospec, number=NUMBER // 20):>21.1f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
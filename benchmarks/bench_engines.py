@@ -0,0 +1,51 @@
+"""Compare the per-test start/stop cost of the patch engines.
+
+`ykcom` measures a whole activation of a fresh instance, `patchers` only the patchers of the engine. The patchers
+install a shared placeholder object instead of new mocks, building the mocks would outweigh the swap itself.
+
+Run with `python -m benchmarks.bench_engines`.
+"""
+
+from __future__ import annotations
+
+from src.ykcom import ykcom
+from src.ykcom.engines import make_patcher
+
+from ._support import MODULE_NAME, best_of, make_module
+
+SIZES = (1, 10, 100)
+ENGINES = ("patch", "fast")
+REPLACEMENT = object()
+
+
+def _replacement() -> object:
+    return REPLACEMENT
+
+
+def main() -> None:
+    print(f"{'targets':>8} {'engine':>8} {'ykcom (us)':>12} {'patchers (us)':>14}")
+    for size in SIZES:
+        names = make_module(size)
+        targets = [f"{MODULE_NAME}.{name}" for name in names]
+        number = max(1, 2000 // size)
+        for engine in ENGINES:
+
+            def run_ykcom(engine: str = engine, names: list[str] = names) -> None:
+                with ykcom(MODULE_NAME, names, engine=engine):  # type: ignore[arg-type]
+                    pass
+
+            def run_patchers(engine: str = engine, targets: list[str] = targets) -> None:
+                patchers = [make_patcher(engine, t, new_callable=_replacement) for t in targets]  # type: ignore[arg-type]
+                for patcher in patchers:
+                    patcher.start()
+                for patcher in reversed(patchers):
+                    patcher.stop()
+
+            print(
+                f"{size:>8} {engine:>8} {best_of(run_ykcom, number=number):>12.1f}"
+                f" {best_of(run_patchers, number=number):>14.1f}",
+            )
+
+
+if __name__ == "__main__":
+    main()
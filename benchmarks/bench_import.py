@@ -0,0 +1,77 @@
+"""Measure the import time of the package with `python -X importtime` and check it against a budget.
+
+The budget applies to the whole import, the standard library modules included: `import ykcom` must not import
+`unittest.mock` (and `asyncio` with it), the public names are imported on first use. Every run is a fresh interpreter,
+the best run is kept.
+
+Run with `python -m benchmarks.bench_import [--runs N] [--budget-ms MS]`, it exits with 1 when over the budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PACKAGE = "src.ykcom"
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _import_times(module: str) -> list[tuple[str, int, int]]:
+    """Import `module` in a fresh interpreter and return the (name, self, cumulative) microseconds per module."""
+    # The bytecode caches are written by the first run, the budget is about the usual imports
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        env=env,
+        text=True,
+    )
+
+    times = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        times.append((name.strip(), int(own), int(cumulative)))
+
+    return times
+
+
+def measure(module: str, runs: int) -> tuple[int, int, list[tuple[str, int, int]]]:
+    """Return the total and own microseconds of the best of `runs` imports of `module`, with its module times."""
+    _import_times(module)
+    results = []
+    for _ in range(runs):
+        times = _import_times(module)
+        total = next(cumulative for name, _, cumulative in times if name == module)
+        own = sum(self_time for name, self_time, _ in times if name.startswith(module))
+        results.append((total, own, times))
+
+    return min(results, key=lambda result: result[0])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=10.0, help="budget of the whole import (default: 10)")
+    args = parser.parse_args()
+
+    total, own, times = measure(PACKAGE, args.runs)
+    print(f"total: {total / 1000:.2f} ms (budget {args.budget_ms:.2f} ms), own modules: {own / 1000:.2f} ms")
+    print(f"{'self (ms)':>10} {'cumulative':>11}  module")
+    for name, self_time, cumulative in sorted(times, key=lambda t: t[2], reverse=True)[:15]:
+        print(f"{self_time / 1000:>10.2f} {cumulative / 1000:>11.2f}  {name}")
+
+    if total > args.budget_ms * 1000:
+        print(f"Over the import budget by {total / 1000 - args.budget_ms:.2f} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
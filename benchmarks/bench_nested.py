@@ -0,0 +1,45 @@
+"""Nested activations patching the same targets.
+
+`outer` is a `ykcom` instance kept active, `inner` is activated `DEPTH` times inside it: with the same returned
+mock (like stacked positional decorators) and with another one (like nested context managers).
+
+Run with `python -m benchmarks.bench_nested`.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+
+from src.ykcom import ykcom
+
+from ._support import MODULE_NAME, best_of, make_module
+
+SIZES = (1, 10)
+NUMBER = 200
+
+
+def main() -> None:
+    print(f"{'targets':>8} {'first (us)':>11} {'same mock (us)':>15} {'other mock (us)':>16}")
+    for size in SIZES:
+        names = make_module(size)
+        first = ykcom(MODULE_NAME, names)
+        other = ykcom(MODULE_NAME, names)
+        same = first._bind(first._mock_data)
+
+        def run(instance: ykcom) -> None:
+            instance._start()
+            instance._stop_patchers(instance._patchers)
+
+        first_time = best_of(partial(run, first), number=NUMBER)
+        first._start()
+        try:
+            same_time = best_of(partial(run, same), number=NUMBER)
+            other_time = best_of(partial(run, other), number=NUMBER)
+        finally:
+            first._stop()
+
+        print(f"{size:>8} {first_time:>11.1f} {same_time:>15.1f} {other_time:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Regression benchmark for a decorated test reused by many parametrized cases.
+
+The time and the memory of the last invocations must stay in line with the first ones.
+
+Run with `python -m benchmarks.bench_parametrize`.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from src.ykcom import ykcom
+
+from ._support import MODULE_NAME, make_module
+
+if TYPE_CHECKING:
+    from unittest.mock import MagicMock
+
+INVOCATIONS = 10_000
+WINDOW = 1_000
+
+
+def main() -> None:
+    names = make_module(5)
+
+    @ykcom(MODULE_NAME, names)
+    def test_case(mocked: MagicMock, param: int) -> None:
+        mocked.dep_0(param)
+
+    tracemalloc.start()
+    timings = []
+    memory = []
+    for param in range(INVOCATIONS):
+        begin = time.perf_counter()
+        test_case(param=param)  # type: ignore[call-arg]
+        timings.append(time.perf_counter() - begin)
+        if param % WINDOW == 0:
+            memory.append(tracemalloc.get_traced_memory()[0])
+    tracemalloc.stop()
+
+    first = sum(timings[:WINDOW]) / WINDOW * 1_000_000
+    last = sum(timings[-WINDOW:]) / WINDOW * 1_000_000
+    print(f"invocations:        {INVOCATIONS}")
+    print(f"first {WINDOW} (us/call): {first:.1f}")
+    print(f"last {WINDOW} (us/call):  {last:.1f}")
+    print(f"memory growth (KiB): {(memory[-1] - memory[1]) / 1024:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare the decoration of tests in a fresh process with and without the plan cache.
+
+Every process decorates test functions like the test modules of a pytest-xdist worker do on collection: with pattern
+targets over a few standard library modules and with a pattern matching the 3000 functions (half of them coroutine
+functions) of a generated module. The cached runs load the plans stored by a previous run. `create` is the creation of
+the `ykcom` instances, where the patterns are expanded, `total` includes the decoration itself.
+
+Run with `python -m benchmarks.bench_plans`.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RUNS = 10
+SIZE = 3000
+
+SCENARIOS = {
+    "stdlib": [
+        ("asyncio.base_events", "ykcom.ALL_IMPORTED_MODULES"),
+        ("unittest.mock", "'_*'"),
+        ("json", "'*'"),
+        ("asyncio.tasks", "['sleep', 'wait_for', 'gather']"),
+    ],
+    "large module": [("generated", "'dep_*'")],
+}
+
+SETUP = """
+import time
+from src.ykcom import ykcom
+
+create = 0.0
+begin = time.perf_counter()
+for base_path, targets in [{targets}]:
+    start = time.perf_counter()
+    instance = ykcom(base_path, targets)
+    create += time.perf_counter() - start
+
+    @instance
+    def test(mocked):
+        pass
+
+print(create * 1_000_000, (time.perf_counter() - begin) * 1_000_000)
+"""
+
+
+def _run(scenario: str, env: dict[str, str]) -> tuple[float, float]:
+    # The targets are source code, like `ykcom.ALL_IMPORTED_MODULES`
+    targets = ", ".join(f"({base_path!r}, {targets})" for base_path, targets in SCENARIOS[scenario])
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", SETUP.format(targets=targets)],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        env=env,
+        text=True,
+    )
+
+    create, total = process.stdout.split()
+    return float(create), float(total)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        module = Path(directory, "generated.py")
+        module.write_text("\n".join(f"{'async ' if i % 2 else ''}def dep_{i}(): ..." for i in range(SIZE)))
+
+        # The bytecode caches are written by the first run, like the usual imports
+        env = {k: v for k, v in os.environ.items() if k not in ("YKCOM_PLAN_CACHE", "PYTHONDONTWRITEBYTECODE")}
+        env["PYTHONPATH"] = os.pathsep.join([directory, env.get("PYTHONPATH", "")])
+        cached_env = {**env, "YKCOM_PLAN_CACHE": str(Path(directory, "plans"))}
+
+        print(f"{'':>12} {'create (us/process)':^29} {'total (us/process)':^29}")
+        print(f"{'scenario':>12}{' no cache    stored    loaded' * 2}")
+        for scenario in SCENARIOS:
+            _run(scenario, env)
+            stored = _run(scenario, cached_env)
+            # The best runs, the machine noise is larger than the differences
+            no_cache = [min(times) for times in zip(*(_run(scenario, env) for _ in range(RUNS)), strict=True)]
+            loaded = [min(times) for times in zip(*(_run(scenario, cached_env) for _ in range(RUNS)), strict=True)]
+            print(
+                f"{scenario:>12} {no_cache[0]:>9.0f} {stored[0]:>9.0f} {loaded[0]:>9.0f}"
+                f" {no_cache[1]:>9.0f} {stored[1]:>9.0f} {loaded[1]:>9.0f}",
+            )
+
+
+if __name__ == "__main__":
+    main()
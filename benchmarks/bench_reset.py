@@ -0,0 +1,60 @@
+"""Compare the reset strategies on deep attribute trees.
+
+Every run walks `WIDTH` attribute chains of `DEPTH` levels and calls a few of them. `reset` is the time spent
+resetting the mock after the run, `cycle` the time of the whole start/run/stop cycle.
+
+Run with `python -m benchmarks.bench_reset`.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from src.ykcom import ykcom
+
+from ._support import MODULE_NAME, make_module
+
+if TYPE_CHECKING:
+    from unittest.mock import MagicMock
+
+STRATEGIES = ("full", "touched", "fresh")
+WIDTH = 50
+DEPTH = 6
+CALLED = 5
+RUNS = 50
+
+
+def _run(mocked: MagicMock) -> None:
+    for i in range(WIDTH):
+        node = getattr(mocked.dep_0, f"attr_{i}")
+        for level in range(DEPTH):
+            node = getattr(node, f"level_{level}")
+        if i < CALLED:
+            node(i)
+
+
+def main() -> None:
+    names = make_module(5)
+
+    print(f"{'strategy':>8} {'reset (us)':>12} {'cycle (us)':>12}")
+    for strategy in STRATEGIES:
+        instance = ykcom(MODULE_NAME, names, reset=strategy)  # type: ignore[arg-type]
+        reset_time = cycle_time = 0.0
+        for _ in range(RUNS):
+            begin = time.perf_counter()
+            instance._start()
+            _run(instance._mock_data.mock)
+            instance._stop_patchers(instance._patchers)
+            reset_begin = time.perf_counter()
+            instance._reset()
+            end = time.perf_counter()
+
+            reset_time += end - reset_begin
+            cycle_time += end - begin
+
+        print(f"{strategy:>8} {reset_time / RUNS * 1_000_000:>12.1f} {cycle_time / RUNS * 1_000_000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
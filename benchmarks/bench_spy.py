@@ -0,0 +1,43 @@
+"""Compare the per-call overhead of the spies with `MagicMock(wraps=...)`.
+
+Every round calls `os.path.join` and reads `os.environ`, directly, through a spy and through a wrapping mock.
+
+Run with `python -m benchmarks.bench_spy`.
+"""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import MagicMock
+
+from src.ykcom import ykcom
+
+from ._support import best_of
+
+NUMBER = 10_000
+
+
+def _use(module: object) -> None:
+    module.path.join("a", "b")  # type: ignore[attr-defined]
+    module.environ.get("HOME")  # type: ignore[attr-defined]
+
+
+def main() -> None:
+    with ykcom(__name__, "os", spy=True) as mocked:
+        spied = best_of(lambda: _use(os), number=NUMBER)
+        mocked.reset_mock()
+
+    wrapped = MagicMock(wraps=os)
+    results = {
+        "direct": best_of(lambda: _use(os), number=NUMBER),
+        "spy": spied,
+        "MagicMock(wraps=)": best_of(lambda: _use(wrapped), number=NUMBER),
+    }
+
+    print(f"{'variant':>18} {'us/round':>9}")
+    for variant, timing in results.items():
+        print(f"{variant:>18} {timing:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
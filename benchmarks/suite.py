@@ -0,0 +1,278 @@
+"""Overhead of `ykcom` compared with hand-written `unittest.mock.patch` stacks.
+
+Every case is measured on the same metrics:
+
+* `decorate_us`: applying the decorators, or creating the reused context manager.
+* `run_us`: one invocation (the whole fan-out for `parametrize`), the patches are started and stopped.
+* `reset_us`: resetting the mock after an invocation. `None` for `patch`, it creates new mocks on every run.
+* `memory_bytes`: peak memory allocated by one invocation.
+
+The axes are the number of targets, stacked named and positional decorators, the `pytest.mark.parametrize`
+fan-out and the context manager use.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+from src.ykcom import ykcom
+from tests.packages_for_testing import p1
+
+from ._support import MODULE_NAME, best_of, make_module
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+FIXTURE_MODULE = "tests.packages_for_testing.p1"
+FIXTURE_TARGETS = ["os", "sys"]
+TARGET_COUNTS = (1, 10, 100)
+STACK_DEPTHS = (1, 2, 4)
+FAN_OUTS = (1, 10, 100)
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Case:
+    """A measured scenario.
+
+    `decorate` returns the callable running one invocation, `instance` returns a `ykcom` instance patching the same
+    targets for the reset measurement and `work` is what an invocation does with the patched targets.
+    """
+
+    axis: str
+    value: int
+    variant: str
+    decorate: Callable[[], Callable[[], object]]
+    work: Callable[[], object]
+    instance: Callable[[], ykcom] | None = None
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Result:
+    axis: str
+    value: int
+    variant: str
+    decorate_us: float
+    run_us: float
+    reset_us: float | None
+    memory_bytes: int
+
+
+def _make_function(params: list[str], work: Callable[[], object]) -> Callable[..., object]:
+    """Return a test function with the given parameters calling `work`."""
+    namespace: dict[str, Any] = {"work": work}
+    exec(f"def test_case({', '.join(params)}):\n    work()", namespace)  # noqa: S102 - generated from fixed names
+    return namespace["test_case"]  # type: ignore[no-any-return]
+
+
+def _use_generated_module() -> None:
+    sys.modules[MODULE_NAME].dep_0.run()
+
+
+def _use_fixture_module() -> None:
+    p1.mock_me("KEY")
+
+
+def _patch_stack(targets: list[str]) -> Callable[..., object]:
+    func = _make_function([f"mock_{i}" for i in range(len(targets))], _use_generated_module)
+    for target in targets:
+        func = patch(target)(func)
+    return func
+
+
+def _targets_cases() -> Iterator[Case]:
+    for size in TARGET_COUNTS:
+        names = make_module(size)
+        targets = [f"{MODULE_NAME}.{name}" for name in names]
+
+        def decorate_ykcom(names: list[str] = names) -> Callable[[], object]:
+            return ykcom(MODULE_NAME, names)(_make_function(["mocked"], _use_generated_module))
+
+        def decorate_patch(targets: list[str] = targets) -> Callable[[], object]:
+            return _patch_stack(targets)
+
+        yield Case(
+            axis="targets",
+            value=size,
+            variant="ykcom",
+            decorate=decorate_ykcom,
+            work=_use_generated_module,
+            instance=lambda names=names: ykcom(MODULE_NAME, names),  # type: ignore[misc]
+        )
+        yield Case(axis="targets", value=size, variant="patch", decorate=decorate_patch, work=_use_generated_module)
+
+
+def _stacked_cases() -> Iterator[Case]:
+    """Alternate positional and named decorators, each patching its own target."""
+    for depth in STACK_DEPTHS:
+        names = make_module(depth)
+        targets = [f"{MODULE_NAME}.{name}" for name in names]
+        layer_names = [None if i % 2 == 0 else f"named_{i}" for i in range(depth)]
+
+        def decorate_ykcom(
+            names: list[str] = names,
+            layer_names: list[str | None] = layer_names,
+        ) -> Callable[[], object]:
+            params = ["mocked", *(name for name in layer_names if name)]
+            func = _make_function(params, _use_generated_module)
+            for target, layer_name in zip(names, layer_names, strict=True):
+                func = ykcom(MODULE_NAME, target, name=layer_name)(func)
+            return func
+
+        def decorate_patch(targets: list[str] = targets) -> Callable[[], object]:
+            return _patch_stack(targets)
+
+        yield Case(axis="stacked", value=depth, variant="ykcom", decorate=decorate_ykcom, work=_use_generated_module)
+        yield Case(axis="stacked", value=depth, variant="patch", decorate=decorate_patch, work=_use_generated_module)
+
+
+def _parametrize_cases() -> Iterator[Case]:
+    """A test of the fixture module called once per parameter, like `pytest.mark.parametrize` does."""
+    targets = [f"{FIXTURE_MODULE}.{name}" for name in FIXTURE_TARGETS]
+    for fan_out in FAN_OUTS:
+
+        def fan_out_calls(func: Callable[..., object], fan_out: int = fan_out) -> Callable[[], object]:
+            def run() -> None:
+                for param in range(fan_out):
+                    func(param=param)
+
+            return run
+
+        def decorate_ykcom(fan_out_calls: Callable[..., Callable[[], object]] = fan_out_calls) -> Callable[[], object]:
+            return fan_out_calls(
+                ykcom(FIXTURE_MODULE, FIXTURE_TARGETS)(_make_function(["mocked", "param"], _use_fixture_module)),
+            )
+
+        def decorate_patch(fan_out_calls: Callable[..., Callable[[], object]] = fan_out_calls) -> Callable[[], object]:
+            func = _make_function(["mock_0", "mock_1", "param"], _use_fixture_module)
+            for target in targets:
+                func = patch(target)(func)
+            return fan_out_calls(func)
+
+        yield Case(
+            axis="parametrize",
+            value=fan_out,
+            variant="ykcom",
+            decorate=decorate_ykcom,
+            work=_use_fixture_module,
+            instance=lambda: ykcom(FIXTURE_MODULE, FIXTURE_TARGETS),
+        )
+        yield Case(
+            axis="parametrize",
+            value=fan_out,
+            variant="patch",
+            decorate=decorate_patch,
+            work=_use_fixture_module,
+        )
+
+
+def _context_manager_cases() -> Iterator[Case]:
+    """`with` blocks: a new `ykcom` per block, one `ykcom` reused for every block and an `ExitStack` of patches."""
+    for size in TARGET_COUNTS:
+        names = make_module(size)
+        targets = [f"{MODULE_NAME}.{name}" for name in names]
+
+        def decorate_new(names: list[str] = names) -> Callable[[], object]:
+            def run() -> None:
+                with ykcom(MODULE_NAME, names):
+                    _use_generated_module()
+
+            return run
+
+        def decorate_reused(names: list[str] = names) -> Callable[[], object]:
+            instance = ykcom(MODULE_NAME, names)
+
+            def run() -> None:
+                with instance:
+                    _use_generated_module()
+
+            return run
+
+        def decorate_patch(targets: list[str] = targets) -> Callable[[], object]:
+            def run() -> None:
+                with ExitStack() as stack:
+                    for target in targets:
+                        stack.enter_context(patch(target))
+                    _use_generated_module()
+
+            return run
+
+        yield Case(
+            axis="context_manager",
+            value=size,
+            variant="ykcom",
+            decorate=decorate_new,
+            work=_use_generated_module,
+        )
+        yield Case(
+            axis="context_manager",
+            value=size,
+            variant="ykcom-reused",
+            decorate=decorate_reused,
+            work=_use_generated_module,
+            instance=lambda names=names: ykcom(MODULE_NAME, names),  # type: ignore[misc]
+        )
+        yield Case(
+            axis="context_manager",
+            value=size,
+            variant="patch",
+            decorate=decorate_patch,
+            work=_use_generated_module,
+        )
+
+
+def cases() -> Iterator[Case]:
+    yield from _targets_cases()
+    yield from _stacked_cases()
+    yield from _parametrize_cases()
+    yield from _context_manager_cases()
+
+
+def _reset_time(case: Case, *, repeat: int) -> float | None:
+    """Return the best time of resetting the mock after an invocation in microseconds."""
+    if case.instance is None:
+        return None
+
+    instance = case.instance()
+    timings = []
+    for _ in range(repeat):
+        instance._start()
+        case.work()
+        instance._stop_patchers(instance._patchers)
+        begin = time.perf_counter()
+        instance._reset()
+        timings.append(time.perf_counter() - begin)
+
+    return min(timings) * 1_000_000
+
+
+def _peak_memory(run: Callable[[], object]) -> int:
+    run()  # Warm up, the allocations cached by the first invocation are not counted
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        run()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def measure(case: Case, *, number: int) -> Result:
+    """Measure `case`, the timings are the best of 5 rounds of `number` calls (divided by the case value at most)."""
+    number = max(1, number // case.value)
+    run = case.decorate()
+
+    return Result(
+        axis=case.axis,
+        value=case.value,
+        variant=case.variant,
+        decorate_us=best_of(case.decorate, number=number),
+        run_us=best_of(run, number=number),
+        reset_us=_reset_time(case, repeat=number),
+        memory_bytes=_peak_memory(run),
+    )
@@ -1 +1,35 @@
-from .ykcom import MockData, ykcom  # noqa: F401
+"""Mock many targets at once with a single mock.
+
+Importing the package is cheap: the public names (and `unittest.mock` with them) are imported on first use.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+
+# Not imported from `typing`, which is slow to import
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+    from .query import query  # noqa: F401
+    from .ykcom import MockData, ykcom  # noqa: F401
+
+# The public names and their modules
+_PUBLIC = {"MockData": "ykcom", "query": "query", "ykcom": "ykcom"}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    if name not in _PUBLIC:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    importlib.import_module(f"{__name__}.{_PUBLIC[name]}")
+    # The import binds the `query` and `ykcom` submodules on the package, the public names replace them
+    names = globals()
+    for public, module in _PUBLIC.items():
+        loaded = sys.modules.get(f"{__name__}.{module}")
+        if loaded is not None and (public not in names or names[public] is loaded):
+            names[public] = getattr(loaded, public)
+
+    return names[name]
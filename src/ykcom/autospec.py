@@ -0,0 +1,137 @@
+"""Autospecced children built once per target object and recycled between the runs."""
+
+from __future__ import annotations
+
+import weakref
+from types import FunctionType
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, MagicMock, NonCallableMagicMock, NonCallableMock, create_autospec, sentinel
+
+from .context import ContextDispatcher
+from .engines import resolve_target
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+# Set on the mocks by `unittest.mock` itself, the other attributes in their `__dict__` are their children
+_OWN_ATTRIBUTES = frozenset(vars(AsyncMock())) | frozenset(vars(MagicMock())) | frozenset(vars(NonCallableMagicMock()))
+
+
+def _is_pristine(mock: NonCallableMock) -> bool:
+    """Whether no attribute of `mock` or of its children was assigned or deleted, the reset does not undo them."""
+    attributes = vars(mock)
+    children = mock._mock_children
+    for name in attributes.keys() - _OWN_ATTRIBUTES:
+        if attributes[name] is not children.get(name) and not name.startswith(("_mock_", "_spec_")):
+            return False
+
+    for child in children.values():
+        # `del mock.name` leaves the `sentinel.DELETED` of `unittest.mock`
+        if child is sentinel.DELETED or (isinstance(child, NonCallableMock) and not _is_pristine(child)):
+            return False
+
+    return True
+
+
+class SpecPool:
+    """Autospecced mocks of one object. `create_autospec` runs only when every built mock is in use.
+
+    `original` returns the object, the shared pools only keep a weak reference to it. The autospecced functions are
+    plain functions wrapping a mock, they are recycled through it.
+    """
+
+    __slots__ = ("_free", "_function_attributes", "original")
+
+    def __init__(self, original: Callable[[], object]) -> None:
+        self.original = original
+        self._free: list[Any] = []
+        # The attributes set on the autospecced functions by `create_autospec`
+        self._function_attributes: frozenset[str] | None = None
+
+    def acquire(self) -> Any:  # noqa: ANN401
+        try:
+            return self._free.pop()
+        except IndexError:
+            mock = create_autospec(self.original())
+            if isinstance(mock, FunctionType):
+                self._function_attributes = frozenset(vars(mock))
+
+            return mock
+
+    def release(self, mock: Any) -> None:  # noqa: ANN401
+        """Reset `mock` and make it available again, detached from its parent.
+
+        The mocks which had attributes assigned or deleted by the run are dropped: they must not leak into the next run.
+        """
+        function: Any = mock if isinstance(mock, FunctionType) else None
+        if function is not None:
+            if vars(function).keys() != self._function_attributes:
+                return
+            mock = function.mock
+
+        if not _is_pristine(mock):
+            return
+
+        mock._mock_parent = mock._mock_new_parent = None
+        mock._mock_name = None
+        mock._mock_new_name = ""
+        mock.reset_mock(return_value=True, side_effect=True)
+        if function is not None:
+            # Their configuration is kept on the function, the reset of the mock does not reach it
+            function.side_effect = None
+            function.return_value = mock._get_child_mock(_new_parent=mock, _new_name="()")
+
+        self._free.append(function or mock)
+
+
+# By the identity of the originals, removed with them
+_pools: dict[int, SpecPool] = {}
+_leased: dict[int, SpecPool] = {}
+
+
+def _forget(key: int, reference: weakref.ref[object]) -> None:
+    pool = _pools.get(key)
+    # The identity may already be reused by a new object with its own pool
+    if pool is not None and pool.original is reference:
+        del _pools[key]
+
+
+def pool_of(original: object) -> SpecPool:
+    """Return the pool of `original`, shared while `original` is alive."""
+    if isinstance(original, ContextDispatcher):
+        original = original._original
+
+    key = id(original)
+    pool = _pools.get(key)
+    if pool is not None and pool.original() is original:
+        return pool
+
+    try:
+        reference = weakref.ref(original, lambda reference: _forget(key, reference))
+    except TypeError:
+        # Not weakly referenceable (like the strings): not shared, the mocks are built on every run
+        return SpecPool(lambda: original)
+
+    pool = _pools[key] = SpecPool(reference)
+    return pool
+
+
+def acquire(target: str) -> Any:  # noqa: ANN401
+    """Return an autospecced mock of the current value of `target`."""
+    owner, attribute = resolve_target(target)
+    original = getattr(owner, attribute)
+    # Nested patching of the same target: the spec is the object behind the active mock
+    pool = _leased.get(id(original)) or pool_of(original)
+
+    mock = pool.acquire()
+    _leased[id(mock)] = pool
+
+    return mock
+
+
+def release(mock: object) -> None:
+    """Return `mock` to its pool, objects not coming from `acquire` are ignored."""
+    pool = _leased.pop(id(mock), None)
+    if pool is not None:
+        pool.release(mock)
@@ -0,0 +1,93 @@
+"""Context-local patching: the mocks are only visible in the context (thread or task) that activated them."""
+
+from __future__ import annotations
+
+import threading
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock
+
+from .engines import AttributePatcher, resolve_target
+from .errors import UnsupportedContextTargetError
+from .proxy import ForwardingProxy
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_bound: ContextVar[dict[str, object]] = ContextVar("ykcom_bound", default={})  # noqa: B039 - never mutated
+_lock = threading.Lock()
+_installed: dict[str, tuple[AttributePatcher, int]] = {}
+
+
+class ContextDispatcher(ForwardingProxy):
+    """Installed in place of a target, forwards to the mock bound in the current context or to the original."""
+
+    __slots__ = ("_original", "_target")
+
+    def __init__(self, target: str, original: object) -> None:
+        self._target = target
+        self._original = original
+
+    def _resolve(self) -> Any:  # noqa: ANN401
+        return _bound.get().get(self._target, self._original)
+
+    def __repr__(self) -> str:
+        return f"<ContextDispatcher {self._target!r} -> {self._resolve()!r}>"
+
+
+def _install(target: str) -> None:
+    """Install the dispatcher of `target`, the dispatchers are shared (and reference counted) by every context.
+
+    Raises:
+        UnsupportedContextTargetError: If `target` is a class.
+    """
+    with _lock:
+        patcher, count = _installed.get(target, (None, 0))
+        if patcher is None:
+            owner, attribute = resolve_target(target)
+            original = getattr(owner, attribute)
+            if isinstance(original, type):
+                # The dispatcher is not a type, the unmocked `isinstance` checks and `except` clauses would fail
+                raise UnsupportedContextTargetError(f"'{attribute}' is a class, use the 'patch' or 'fast' engine")
+
+            dispatcher = ContextDispatcher(target, original)
+            patcher = AttributePatcher(target, new_callable=lambda: dispatcher)
+            patcher.start()
+
+        _installed[target] = (patcher, count + 1)
+
+
+def _uninstall(target: str) -> None:
+    with _lock:
+        patcher, count = _installed[target]
+        if count == 1:
+            patcher.stop()
+            del _installed[target]
+        else:
+            _installed[target] = (patcher, count - 1)
+
+
+class ContextLocalPatcher:
+    """Bind a new mock to `target` in the current context, the other contexts keep seeing the original."""
+
+    __slots__ = ("_new_callable", "_target", "_token")
+
+    def __init__(self, target: str, *, new_callable: Callable[[], Any] = MagicMock) -> None:
+        self._target = target
+        self._new_callable = new_callable
+        self._token: Token[dict[str, object]] | None = None
+
+    def start(self) -> Any:  # noqa: ANN401
+        _install(self._target)
+
+        new_mock = self._new_callable()
+        self._token = _bound.set({**_bound.get(), self._target: new_mock})
+
+        return new_mock
+
+    def stop(self) -> None:
+        if self._token is not None:
+            _bound.reset(self._token)
+            self._token = None
+
+        _uninstall(self._target)
@@ -0,0 +1,90 @@
+"""Patch engines used by `ykcom` to replace the targets."""
+
+from __future__ import annotations
+
+import inspect
+import pkgutil
+from typing import TYPE_CHECKING, Any, Literal
+from unittest.mock import MagicMock, patch
+
+from .errors import UnknownEngineError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .types import Patcher
+
+Engine = Literal["patch", "fast", "context"]
+
+_resolved: dict[str, tuple[object, str]] = {}
+
+
+def resolve_target(target: str) -> tuple[object, str]:
+    """Resolve the object owning `target` and the name of the patched attribute.
+
+    The result is cached for the lifetime of the process, the dotted path is only imported and walked once.
+    """
+    try:
+        return _resolved[target]
+    except KeyError:
+        owner_path, _, attribute = target.rpartition(".")
+        resolved = _resolved[target] = (pkgutil.resolve_name(owner_path), attribute)
+        return resolved
+
+
+def is_coroutine_target(target: str) -> bool:
+    """Check whether `target` currently refers to a coroutine function."""
+    owner, attribute = resolve_target(target)
+    return inspect.iscoroutinefunction(getattr(owner, attribute))
+
+
+class AttributePatcher:
+    """Patch a target by swapping the attribute on its owner and restoring it directly on stop."""
+
+    __slots__ = ("_attribute", "_local", "_new_callable", "_original", "_owner")
+
+    def __init__(self, target: str, *, new_callable: Callable[[], Any] = MagicMock) -> None:
+        self._owner, self._attribute = resolve_target(target)
+        self._new_callable = new_callable
+        self._original: object = None
+        self._local = False
+
+    def start(self) -> Any:  # noqa: ANN401
+        owner_dict = getattr(self._owner, "__dict__", {})
+        if self._attribute in owner_dict:
+            self._original = owner_dict[self._attribute]
+            self._local = True
+        else:
+            self._original = getattr(self._owner, self._attribute)
+            self._local = False
+
+        new_mock = self._new_callable()
+        setattr(self._owner, self._attribute, new_mock)
+
+        return new_mock
+
+    def stop(self) -> None:
+        if self._local:
+            setattr(self._owner, self._attribute, self._original)
+        else:
+            delattr(self._owner, self._attribute)
+
+        self._original = None
+
+
+def make_patcher(engine: Engine, target: str, *, new_callable: Callable[[], Any] = MagicMock) -> Patcher:
+    """Create a patcher for `target` with the given engine, the target is replaced by the result of `new_callable`.
+
+    Raises:
+        UnknownEngineError: If the engine is not supported.
+    """
+    if engine == "patch":
+        return patch(target, new_callable=new_callable)
+    if engine == "fast":
+        return AttributePatcher(target, new_callable=new_callable)
+    if engine == "context":
+        from .context import ContextLocalPatcher  # noqa: PLC0415 - circular import
+
+        return ContextLocalPatcher(target, new_callable=new_callable)
+
+    raise UnknownEngineError(f"Unknown engine '{engine}'")
@@ -12,3 +12,23 @@ class TargetAlreadyBoundError(YckomError):
 
 class NameCollisionError(YckomError):
     """The same name has been provided for multiple targets."""
+
+
+class UnknownEngineError(YckomError):
+    """The requested patch engine is not supported."""
+
+
+class UnknownRecordModeError(YckomError):
+    """The requested call recording mode is not supported."""
+
+
+class UnknownRetainPolicyError(YckomError):
+    """The requested argument retain policy is not supported."""
+
+
+class PatternNotMatchedError(YckomError):
+    """A target pattern did not match any attribute of its module."""
+
+
+class UnsupportedContextTargetError(YckomError):
+    """The context engine cannot patch the target, like a class."""
@@ -0,0 +1,97 @@
+"""Streaming of the recorded calls to JSON lines files."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .recording import safe_repr
+
+if TYPE_CHECKING:
+    from unittest.mock import _Call, _CallList
+
+BATCH_SIZE = 1000
+
+
+class CallExporter:
+    """Append the calls to `path` as JSON lines, written in batches of `batch_size` calls and on `flush`.
+
+    A record has the pytest id of the test (`null` outside of tests), the path of the call, the reprs of the arguments
+    and a `time.monotonic` timestamp.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], *, batch_size: int = BATCH_SIZE) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+
+    def write(self, value: _Call) -> None:
+        path, args, kwargs = value
+        test = os.environ.get("PYTEST_CURRENT_TEST")
+        record = {
+            # The variable ends with the phase of the test, like " (call)"
+            "test": test.rpartition(" ")[0] if test else None,
+            "path": path,
+            "args": [safe_repr(a) for a in args],
+            "kwargs": {k: safe_repr(v) for k, v in kwargs.items()},
+            "time": time.monotonic(),
+        }
+        line = json.dumps(record)
+        # The calls are recorded by every thread using the mock
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        lines, self._buffer = self._buffer, []
+        if lines:
+            with self.path.open("a", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+
+    def install(self, calls: _CallList) -> None:
+        """Make `calls` stream the appended calls to this exporter."""
+        base = type(calls)
+        if not issubclass(base, _ExportingCallList):
+            if base not in _list_classes:
+                _list_classes[base] = type(f"Exporting{base.__name__}", (_ExportingCallList, base), {})
+            calls.__class__ = _list_classes[base]
+
+        calls.exporter = self  # type: ignore[attr-defined]
+
+
+class _ExportingCallList:
+    exporter: CallExporter
+
+    def append(self, value: _Call) -> None:
+        self.exporter.write(value)
+        super().append(value)  # type: ignore[misc]
+
+
+_list_classes: dict[type, type] = {}
+_exporters: dict[Path, CallExporter] = {}
+
+
+def exporter_for(path: str | os.PathLike[str]) -> CallExporter:
+    """Return the exporter of `path`, shared by every instance exporting to the same file."""
+    key = Path(path).resolve()
+    if key not in _exporters:
+        _exporters[key] = CallExporter(key)
+
+    return _exporters[key]
+
+
+@atexit.register
+def _flush_all() -> None:
+    for exporter in _exporters.values():
+        exporter.flush()
@@ -0,0 +1,98 @@
+"""Pattern targets, expanded against a per-module index of the attributes."""
+
+from __future__ import annotations
+
+import importlib
+import os
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from types import ModuleType
+from typing import TYPE_CHECKING, Final
+
+from .errors import PatternNotMatchedError
+
+if TYPE_CHECKING:
+    from importlib.machinery import ModuleSpec
+
+# Not a valid attribute name, it cannot shadow a real target
+ALL_IMPORTED_MODULES: Final = "<all imported modules>"
+
+_PATTERN_CHARACTERS = frozenset("*?[")
+
+# The patterns of smaller modules are matched faster than their plans are read from the plan cache
+CACHED_MODULE_SIZE = 500
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class ModuleIndex:
+    """Attribute names of a module (dunder names excluded) in definition order, with the matched patterns cached.
+
+    `spec` is the `__spec__` of the module when it was indexed, reloading the module replaces it.
+    """
+
+    module: ModuleType
+    spec: ModuleSpec | None
+    names: tuple[str, ...]
+    modules: tuple[str, ...]
+    matches: dict[str, tuple[str, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, module: ModuleType) -> ModuleIndex:
+        attributes = {name: value for name, value in vars(module).items() if not name.startswith("__")}
+
+        return cls(
+            module=module,
+            spec=module.__spec__,
+            names=tuple(attributes),
+            modules=tuple(name for name, value in attributes.items() if isinstance(value, ModuleType)),
+        )
+
+    def match(self, pattern: str) -> tuple[str, ...]:
+        if pattern not in self.matches:
+            self.matches[pattern] = (
+                self.modules
+                if pattern == ALL_IMPORTED_MODULES
+                else tuple(name for name in self.names if fnmatchcase(name, pattern))
+            )
+
+        return self.matches[pattern]
+
+
+_indexes: dict[str, ModuleIndex] = {}
+
+
+def module_index(name: str) -> ModuleIndex:
+    """Return the index of the module `name`, built on first use and rebuilt when the module is reloaded."""
+    module = importlib.import_module(name)
+    index = _indexes.get(name)
+    if index is None or index.module is not module or index.spec is not module.__spec__:
+        index = _indexes[name] = ModuleIndex.build(module)
+
+    return index
+
+
+def is_pattern(attribute: str) -> bool:
+    return attribute == ALL_IMPORTED_MODULES or not _PATTERN_CHARACTERS.isdisjoint(attribute)
+
+
+def expand(target: str) -> list[str]:
+    """Return the targets matched by `target`, the target itself if it is not a pattern.
+
+    Raises:
+        PatternNotMatchedError: If the pattern does not match any attribute of the module.
+    """
+    owner, _, attribute = target.rpartition(".")
+    if not is_pattern(attribute):
+        return [target]
+
+    directory = os.environ.get("YKCOM_PLAN_CACHE")
+    if directory and len(vars(module := importlib.import_module(owner))) >= CACHED_MODULE_SIZE:
+        from .plans import plan_cache  # noqa: PLC0415 - optional, loaded on first use
+
+        names = plan_cache(directory).match(module, attribute)
+    else:
+        names = module_index(owner).match(attribute)
+    if not names:
+        raise PatternNotMatchedError(f"'{attribute}' does not match any attribute of '{owner}'")
+
+    return [f"{owner}.{name}" for name in names]
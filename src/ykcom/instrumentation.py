@@ -0,0 +1,164 @@
+"""Optional timing of the patching work, aggregated by test and by target.
+
+Off by default: `recorder` is `None` and `ykcom` only checks it when the patchers are created and when a run stops.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+from .recording import ArgSummary, WeakArg
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from unittest.mock import _Call
+
+    from .types import Patcher
+
+Phase = Literal["resolve", "start", "stop", "reset"]
+
+
+@dataclass(kw_only=True, slots=True)
+class Timings:
+    """Seconds spent per phase, the number of mock nodes created and the bytes retained by the recorded calls."""
+
+    resolve: float = 0.0
+    start: float = 0.0
+    stop: float = 0.0
+    reset: float = 0.0
+    nodes: int = 0
+    retained: int = 0
+
+    @property
+    def total(self) -> float:
+        return self.resolve + self.start + self.stop + self.reset
+
+    def add(self, other: Timings) -> None:
+        self.resolve += other.resolve
+        self.start += other.start
+        self.stop += other.stop
+        self.reset += other.reset
+        self.nodes += other.nodes
+        self.retained += other.retained
+
+
+class Recorder:
+    """Collect the timings per (test, target). `current_test` is set by the runner, like the bundled pytest plugin."""
+
+    def __init__(self) -> None:
+        self.current_test: str | None = None
+        self.timings: dict[tuple[str | None, str], Timings] = {}
+
+    def _timings(self, target: str) -> Timings:
+        key = (self.current_test, target)
+        if key not in self.timings:
+            self.timings[key] = Timings()
+
+        return self.timings[key]
+
+    def record(self, phase: Phase, target: str, seconds: float) -> None:
+        timings = self._timings(target)
+        setattr(timings, phase, getattr(timings, phase) + seconds)
+
+    def record_nodes(self, target: str, nodes: int) -> None:
+        self._timings(target).nodes += nodes
+
+    def record_retained(self, target: str, size: int) -> None:
+        self._timings(target).retained += size
+
+    def by_test(self) -> dict[str | None, Timings]:
+        return self._aggregate(0)
+
+    def by_target(self) -> dict[str, Timings]:
+        return self._aggregate(1)
+
+    def _aggregate(self, index: int) -> dict[Any, Timings]:
+        result: dict[Any, Timings] = {}
+        for key, timings in self.timings.items():
+            result.setdefault(key[index], Timings()).add(timings)
+
+        return result
+
+
+recorder: Recorder | None = None
+
+
+def enable() -> Recorder:
+    """Start recording the timings, the previous recorder (if any) is kept."""
+    global recorder  # noqa: PLW0603
+    if recorder is None:
+        recorder = Recorder()
+
+    return recorder
+
+
+def disable() -> None:
+    global recorder  # noqa: PLW0603
+    recorder = None
+
+
+class TimedPatcher:
+    """Record the time spent starting and stopping `patcher`."""
+
+    __slots__ = ("_patcher", "_target")
+
+    def __init__(self, patcher: Patcher, target: str) -> None:
+        self._patcher = patcher
+        self._target = target
+
+    def start(self) -> Any:  # noqa: ANN401
+        begin = time.perf_counter()
+        try:
+            return self._patcher.start()
+        finally:
+            if recorder is not None:
+                recorder.record("start", self._target, time.perf_counter() - begin)
+
+    def stop(self) -> None:
+        begin = time.perf_counter()
+        try:
+            self._patcher.stop()
+        finally:
+            if recorder is not None:
+                recorder.record("stop", self._target, time.perf_counter() - begin)
+
+
+def count_nodes(mock: object) -> int:
+    """Return the number of mocks in the tree of `mock`: the children and the return values."""
+    count = 0
+    stack = [mock]
+    seen: set[int] = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in seen or not hasattr(node, "_mock_children"):
+            continue
+
+        seen.add(id(node))
+        count += 1
+        stack.extend(node._mock_children.values())
+        stack.append(getattr(node, "_mock_return_value", None))
+
+    return count
+
+
+def retained_bytes(calls: Iterable[_Call]) -> dict[str, int]:
+    """Return the bytes retained by the arguments of `calls` per first path segment.
+
+    The sizes are shallow (`sys.getsizeof`), weakly referenced arguments count as 0 and summarized ones as their repr.
+    """
+    result: dict[str, int] = {}
+    for name, args, kwargs in calls:
+        size = 0
+        for value in (*args, *kwargs.values()):
+            if isinstance(value, ArgSummary):
+                size += sys.getsizeof(value.repr)
+            elif not isinstance(value, WeakArg):
+                size += sys.getsizeof(value)
+
+        head = name.partition(".")[0]
+        result[head] = result.get(head, 0) + size
+
+    return result
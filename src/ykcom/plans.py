@@ -0,0 +1,130 @@
+"""Pattern matches cached on disk for the processes started often, like the pytest-xdist workers.
+
+Expanding a pattern target matches the pattern against every attribute of its module, the costly part of creating
+the `ykcom` instances of large modules (the smaller ones are not cached, see `index.CACHED_MODULE_SIZE`). The matches
+are cached per module as picklable `ModulePlan` objects, keyed by the path, size and modification time of the source
+of the module (like the bytecode caches): editing the module invalidates them. Whether the targets are coroutine
+functions depends on the modules defining them, it is not cached. Off by default, `YKCOM_PLAN_CACHE` sets the cache
+directory.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import marshal
+import os
+import sys
+import threading
+from typing import TYPE_CHECKING, Any
+
+from .index import module_index
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+# Part of the keys, bumped when the content of the plans changes
+PLAN_VERSION = 3
+
+# The path, modification time and size of the source of a module
+Source = tuple[Any, ...]
+
+
+class ModulePlan:
+    """The attribute names matched by the patterns expanded against `module`, valid while `source` is unchanged.
+
+    Not a dataclass: building one costs more than a warm worker spends on the patterns of a usual module.
+    """
+
+    __slots__ = ("matches", "module", "source")
+
+    def __init__(
+        self,
+        *,
+        module: str,
+        source: Source,
+        matches: dict[str, tuple[str, ...]] | None = None,
+    ) -> None:
+        self.module = module
+        self.source = source
+        self.matches = {} if matches is None else matches
+
+
+def _source(module: ModuleType) -> Source:
+    """Return the path, modification time and size of the source of `module`."""
+    spec = module.__spec__
+    if spec is None or not spec.has_location or spec.origin is None:
+        # Built-in and frozen modules change with the interpreter only
+        return module.__name__, sys.hexversion
+
+    stat = os.stat(spec.origin)
+    return spec.origin, stat.st_mtime_ns, stat.st_size
+
+
+class PlanCache:
+    """Directory of plans, one file per module. The files are replaced atomically, the processes can share it.
+
+    The plans are stored with `marshal` (`pickle` is not imported by the workers otherwise), along with their source:
+    a plan of another version of the module is a miss.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        # The plans read or written by the process
+        self._plans: dict[str, ModulePlan] = {}
+
+    def match(self, module: ModuleType, pattern: str) -> tuple[str, ...]:
+        """Return the names of the attributes of `module` matched by `pattern`, from the cache if it has them."""
+        name = module.__name__
+        source = _source(module)
+        plan = self._plans.get(name)
+        if plan is None or plan.source != source:
+            plan = self._plans[name] = self.load(name, source) or ModulePlan(module=name, source=source)
+
+        names = plan.matches.get(pattern)
+        if names is None:
+            names = plan.matches[pattern] = module_index(name).match(pattern)
+            self.store(plan)
+
+        return names
+
+    def _path(self, module: str) -> str:
+        return os.path.join(self.directory, f"{module}.plan")
+
+    def load(self, module: str, source: Source) -> ModulePlan | None:
+        try:
+            # Read at once, `marshal.load` reads the file in small pieces
+            with open(self._path(module), "rb") as file:
+                version, stored_source, matches = marshal.loads(file.read())  # noqa: S302 - written by `store`
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if version != PLAN_VERSION or stored_source != source:
+            return None
+
+        return ModulePlan(module=module, source=source, matches=matches)
+
+    def store(self, plan: ModulePlan) -> None:
+        """Store `plan`, best effort: the cache must not fail the decoration (like on a read-only or full disk)."""
+        path = self._path(plan.module)
+        # Written next to the plan and renamed, the readers never see partial files
+        temporary = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary, "wb") as file:
+                marshal.dump((PLAN_VERSION, plan.source, plan.matches), file)
+
+            os.replace(temporary, path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(temporary)
+
+
+_caches: dict[str, PlanCache] = {}
+
+
+def plan_cache(directory: str) -> PlanCache:
+    """Return the cache of `directory`, shared by the `ykcom` instances of the process."""
+    if directory not in _caches:
+        _caches[directory] = PlanCache(directory)
+
+    return _caches[directory]
@@ -0,0 +1,95 @@
+"""Lightweight objects installed in place of the targets."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .engines import resolve_target
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from unittest.mock import MagicMock
+
+# Magic methods looked up on the type, they must be defined on the proxy class to reach the wrapped object
+_FORWARDED_MAGICS = (
+    "__aenter__",
+    "__aexit__",
+    "__aiter__",
+    "__anext__",
+    "__bool__",
+    "__contains__",
+    "__delitem__",
+    "__enter__",
+    "__exit__",
+    "__float__",
+    "__fspath__",
+    "__getitem__",
+    "__index__",
+    "__int__",
+    "__iter__",
+    "__len__",
+    "__next__",
+    "__setitem__",
+    "__str__",
+)
+
+
+class ForwardingProxy:
+    """Base of the proxies: attribute access, calls and the common magic methods are forwarded to `_resolve()`."""
+
+    __slots__ = ()
+
+    def _resolve(self) -> Any:  # noqa: ANN401
+        raise NotImplementedError
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if name in self.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._resolve(), name, value)
+
+    def __call__(self, *args: object, **kwargs: object) -> Any:  # noqa: ANN401
+        return self._resolve()(*args, **kwargs)
+
+
+def _forward(name: str) -> Callable[..., Any]:
+    def method(self: ForwardingProxy, *args: object, **kwargs: object) -> Any:  # noqa: ANN401
+        return getattr(self._resolve(), name)(*args, **kwargs)
+
+    method.__name__ = name
+    return method
+
+
+for _name in _FORWARDED_MAGICS:
+    setattr(ForwardingProxy, _name, _forward(_name))
+
+
+class LazyChild(ForwardingProxy):
+    """Placeholder of a target, the child mock is only created (and attached to the parent) on first use.
+
+    Once created, the child replaces the placeholder on the patched owner, so later lookups reach it directly.
+    """
+
+    __slots__ = ("_child", "_name", "_parent", "_target")
+
+    def __init__(self, parent: MagicMock, name: str, target: str) -> None:
+        self._parent = parent
+        self._name = name
+        self._target = target
+        self._child: MagicMock | None = None
+
+    def _resolve(self) -> MagicMock:
+        if self._child is None:
+            self._child = getattr(self._parent, self._name)
+
+            owner, attribute = resolve_target(self._target)
+            if getattr(owner, attribute, None) is self:
+                setattr(owner, attribute, self._child)
+
+        return self._child
+
+    def __repr__(self) -> str:
+        return f"<LazyChild {self._name!r} of {self._parent!r}>"
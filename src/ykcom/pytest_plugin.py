@@ -0,0 +1,143 @@
+"""pytest plugin of ykcom.
+
+It reports the time spent patching and resetting, per test and per target, with `--ykcom-timings`.
+`--ykcom-timings-json=PATH` also writes the collected timings as JSON. `--ykcom-update-snapshots` updates the
+call snapshots.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from _pytest.terminal import TerminalReporter
+
+    from .instrumentation import Recorder, Timings
+
+# The configuration of the running session, read by the snapshots: the plugin is loaded by every pytest process, it
+# does not import the optional subsystems unless their options are given
+session_config: pytest.Config | None = None
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("ykcom")
+    group.addoption(
+        "--ykcom-timings",
+        action="store_true",
+        help="Report the time spent by ykcom resolving, starting, stopping and resetting the mocks.",
+    )
+    group.addoption("--ykcom-timings-json", metavar="PATH", help="Write the ykcom timings to PATH as JSON.")
+    group.addoption(
+        "--ykcom-timings-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of targets and tests listed in the ykcom timings summary (default: 10).",
+    )
+    group.addoption(
+        "--ykcom-update-snapshots",
+        action="store_true",
+        help="Store the recorded calls as the new snapshots instead of comparing them.",
+    )
+
+
+def _enabled(config: pytest.Config) -> bool:
+    return bool(config.getoption("ykcom_timings") or config.getoption("ykcom_timings_json"))
+
+
+def _recorder() -> Recorder | None:
+    instrumentation = sys.modules.get(f"{__package__}.instrumentation")
+    return None if instrumentation is None else instrumentation.recorder
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if _enabled(config):
+        from . import instrumentation  # noqa: PLC0415 - only imported with the timings options
+
+        instrumentation.enable()
+
+    global session_config  # noqa: PLW0603
+    session_config = config
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    if _enabled(config):
+        from . import instrumentation  # noqa: PLC0415 - imported by `pytest_configure`
+
+        instrumentation.disable()
+
+    global session_config  # noqa: PLW0603
+    session_config = None
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item: pytest.Item) -> Generator[None, object, object]:
+    recorder = _recorder()
+    if recorder is None:
+        return (yield)
+
+    recorder.current_test = item.nodeid
+    try:
+        return (yield)
+    finally:
+        recorder.current_test = None
+
+
+def _as_dict(timings: Timings) -> dict[str, float | int]:
+    return {
+        "total": timings.total,
+        "resolve": timings.resolve,
+        "start": timings.start,
+        "stop": timings.stop,
+        "reset": timings.reset,
+        "nodes": timings.nodes,
+        "retained": timings.retained,
+    }
+
+
+def _write_table(terminalreporter: TerminalReporter, title: str, rows: dict[str, Timings], top: int) -> None:
+    terminalreporter.write_line(title)
+    terminalreporter.write_line(
+        f"{'total (ms)':>11} {'resolve':>9} {'start':>9} {'stop':>9} {'reset':>9} {'nodes':>7} {'retained':>10}  name",
+    )
+    for name, timings in sorted(rows.items(), key=lambda item: item[1].total, reverse=True)[:top]:
+        terminalreporter.write_line(
+            f"{timings.total * 1000:>11.2f} {timings.resolve * 1000:>9.2f} {timings.start * 1000:>9.2f}"
+            f" {timings.stop * 1000:>9.2f} {timings.reset * 1000:>9.2f} {timings.nodes:>7}"
+            f" {timings.retained:>10}  {name}",
+        )
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter, config: pytest.Config) -> None:
+    recorder = _recorder()
+    if recorder is None:
+        return
+
+    by_target = recorder.by_target()
+    by_test = {test or "<outside of tests>": timings for test, timings in recorder.by_test().items()}
+
+    if config.getoption("ykcom_timings"):
+        top = config.getoption("ykcom_timings_top")
+        terminalreporter.write_sep("=", "ykcom timings")
+        _write_table(terminalreporter, f"Most expensive targets (top {top}):", by_target, top)
+        terminalreporter.write_line("")
+        _write_table(terminalreporter, f"Most expensive tests (top {top}):", by_test, top)
+
+    if path := config.getoption("ykcom_timings_json"):
+        report = {
+            "targets": {target: _as_dict(timings) for target, timings in by_target.items()},
+            "tests": {test: _as_dict(timings) for test, timings in by_test.items()},
+            "timings": [
+                {"test": test, "target": target, **_as_dict(timings)}
+                for (test, target), timings in recorder.timings.items()
+            ],
+        }
+        Path(path).write_text(json.dumps(report, indent=2))
+        terminalreporter.write_line(f"ykcom timings written to {path}")
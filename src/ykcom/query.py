@@ -0,0 +1,135 @@
+"""Indexed queries over the calls recorded by a mock."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Any
+from unittest.mock import _CallList
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from unittest.mock import NonCallableMock, _Call
+
+
+class IndexedCallList(_CallList):
+    """Call list maintaining the positions of the calls per call path while the calls are appended.
+
+    The other changes of the list (like `del`, `clear` and `extend`) index it again.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.positions: dict[str, list[int]] = {}
+
+    def append(self, value: _Call) -> None:
+        self.positions.setdefault(value[0], []).append(len(self))
+        super().append(value)
+
+    @property
+    def paths(self) -> set[str]:
+        return set(self.positions)
+
+    def _reindex(self) -> None:
+        # In place, the indexes of the queries keep the dictionary
+        self.positions.clear()
+        for i, c in enumerate(self):
+            self.positions.setdefault(c[0], []).append(i)
+
+
+def _reindexing(name: str) -> Callable[..., Any]:
+    def method(self: IndexedCallList, *args: object, **kwargs: object) -> Any:  # noqa: ANN401
+        result = getattr(super(IndexedCallList, self), name)(*args, **kwargs)
+        self._reindex()
+        return result
+
+    method.__name__ = name
+    return method
+
+
+for _name in (
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "__setitem__",
+    "clear",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+    "sort",
+):
+    setattr(IndexedCallList, _name, _reindexing(_name))
+
+
+def _positions(calls: list[_Call]) -> dict[str, list[int]]:
+    if isinstance(calls, IndexedCallList):
+        return calls.positions
+
+    # Plain and bounded lists are indexed on the fly
+    positions: dict[str, list[int]] = {}
+    for i, c in enumerate(calls):
+        positions.setdefault(c[0], []).append(i)
+
+    return positions
+
+
+class CallIndex:
+    """Queries on the calls of a mock by call path, like `"os.environ.__getitem__"`.
+
+    The calls recorded on the mock returned by `ykcom` are indexed while they are recorded, the queries do not scan
+    the whole call list. Other mocks are indexed once, when the `CallIndex` is created.
+    """
+
+    __slots__ = ("_calls", "_counts", "_positions")
+
+    def __init__(self, mock: NonCallableMock) -> None:
+        self._calls: list[_Call] = mock.mock_calls
+        self._positions = _positions(self._calls)
+        # Only the number of calls is available in the "counts" recording mode
+        self._counts: dict[str, int] | None = getattr(self._calls, "counts", None)
+
+    def calls_to(self, path: str) -> list[_Call]:
+        """Return the calls with the given path, in the order of the calls."""
+        return [self._calls[i] for i in self._positions.get(path, ())]
+
+    def count(self, path: str) -> int:
+        """Return the number of calls with the given path."""
+        if self._counts is not None:
+            return self._counts.get(path, 0)
+
+        return len(self._positions.get(path, ()))
+
+    def first(self, path: str) -> _Call | None:
+        """Return the first call with the given path or `None`."""
+        positions = self._positions.get(path)
+        return self._calls[positions[0]] if positions else None
+
+    def last(self, path: str) -> _Call | None:
+        """Return the last call with the given path or `None`."""
+        positions = self._positions.get(path)
+        return self._calls[positions[-1]] if positions else None
+
+    def contains_in_order(self, *calls: _Call) -> bool:
+        """Check whether the given calls were made in this order, other calls might happen in between.
+
+        ```python
+        assert query(mocked).contains_in_order(call.os.getenv("A"), call.sys.exit(1))
+        ```
+        """
+        position = -1
+        for expected in calls:
+            positions = self._positions.get(expected[0], [])
+            for i in positions[bisect_right(positions, position) :]:
+                if self._calls[i] == expected:
+                    position = i
+                    break
+            else:
+                return False
+
+        return True
+
+
+def query(mock: NonCallableMock) -> CallIndex:
+    """Return the call queries of `mock`, usually the mock returned by `ykcom`."""
+    return CallIndex(mock)
@@ -0,0 +1,429 @@
+"""Call recording modes limiting what the mocks keep from the calls."""
+
+from __future__ import annotations
+
+import re
+import reprlib
+import sys
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, ClassVar, Literal
+from unittest.mock import AsyncMock, AsyncMockMixin, MagicMock, _Call, _CallList
+
+from .errors import UnknownRecordModeError, UnknownRetainPolicyError
+from .query import IndexedCallList
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from unittest.mock import NonCallableMock
+
+    from .export import CallExporter
+
+RecordMode = Literal["full", "ring", "counts", "summary"]
+RetainMode = Literal["full", "weak", "repr"]
+
+_ASYNC_MAGICS = {"__aenter__", "__aexit__", "__anext__"}
+_RING_PATTERN = re.compile(r"ring\((\d+)\)")
+_REPR_PATTERN = re.compile(r"repr\((\d+)\)")
+_REPR_SIZE = 80
+# Values without weak reference support up to this size are kept in the "weak" retain mode
+_WEAK_FALLBACK_SIZE = 1024
+_reprs: dict[int, reprlib.Repr] = {}
+# The ring lists drop their older calls in batches of at least this size
+_RING_BATCH = 256
+
+
+def _call_path(value: _Call) -> str:
+    # Entries of `mock_calls` are (name, args, kwargs), entries of `call_args_list` are (args, kwargs)
+    return value[0] if len(value) == 3 else ""  # noqa: PLR2004
+
+
+class RingCallList(_CallList):
+    """Call list keeping only the last `maxlen` calls.
+
+    The older calls are dropped in batches of `maxlen` calls or more (dropping them one by one moves the whole list on
+    every call), the reads drop the pending ones first.
+    """
+
+    def __init__(self, maxlen: int) -> None:
+        super().__init__()
+        self.maxlen = maxlen
+        self._limit = maxlen + max(maxlen, _RING_BATCH)
+        self._dropped_paths: set[str] = set()
+
+    def append(self, value: _Call) -> None:
+        # Called for every call of the mocks, `super()` is slower
+        list.append(self, value)
+        if list.__len__(self) >= self._limit:
+            self._trim()
+
+    def _trim(self) -> None:
+        if (excess := super().__len__() - self.maxlen) > 0:
+            self._dropped_paths.update(map(_call_path, super().__getitem__(slice(excess))))
+            del self[:excess]
+
+    @property
+    def paths(self) -> set[str]:
+        """The path of every call appended since the list was created, including the dropped ones."""
+        return self._dropped_paths | {_call_path(c) for c in self}
+
+    def __len__(self) -> int:
+        self._trim()
+        return super().__len__()
+
+    def __iter__(self) -> Iterator[_Call]:
+        self._trim()
+        return super().__iter__()
+
+    def __reversed__(self) -> Iterator[_Call]:
+        self._trim()
+        return super().__reversed__()
+
+    def __getitem__(self, index: Any) -> Any:  # noqa: ANN401
+        self._trim()
+        return super().__getitem__(index)
+
+    def __contains__(self, value: object) -> bool:
+        self._trim()
+        return super().__contains__(value)
+
+    def __eq__(self, other: object) -> bool:
+        self._trim()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        self._trim()
+        return super().__ne__(other)
+
+    # Unhashable like the lists
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        self._trim()
+        return super().__repr__()
+
+    def index(self, value: _Call, *args: Any) -> int:  # noqa: ANN401
+        self._trim()
+        return super().index(value, *args)
+
+    def count(self, value: _Call) -> int:
+        self._trim()
+        return super().count(value)
+
+
+class CountingCallList(_CallList):
+    """Call list keeping only the number of calls per path in `counts`, the calls themselves are dropped."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.counts: Counter[str] = Counter()
+
+    def append(self, value: _Call) -> None:
+        self.counts[_call_path(value)] += 1
+
+    @property
+    def paths(self) -> set[str]:
+        return set(self.counts)
+
+
+class ArgSummary:
+    """Stand-in of a call argument keeping only its shortened repr and a fingerprint.
+
+    The fingerprint is the hash of the value, or the digest of the content of unhashable buffers (like `bytearray`).
+    It compares equal to the values with the same repr and fingerprint, so the usual call assertions keep working.
+    """
+
+    __slots__ = ("hash", "repr", "size")
+
+    def __init__(self, value: object, size: int = _REPR_SIZE) -> None:
+        self.size = size
+        self.repr = safe_repr(value, size)
+        self.hash = _fingerprint(value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ArgSummary):
+            other = ArgSummary(other, self.size)
+
+        return self.repr == other.repr and self.hash == other.hash
+
+    def __hash__(self) -> int:
+        return hash(self.repr)
+
+    def __repr__(self) -> str:
+        return self.repr
+
+
+def safe_repr(value: object, size: int = _REPR_SIZE) -> str:
+    """Return the repr of `value` shortened to `size` characters, the default repr if its own one raises."""
+    if size not in _reprs:
+        _reprs[size] = reprlib.Repr()
+        _reprs[size].maxstring = _reprs[size].maxother = size
+
+    try:
+        text = _reprs[size].repr(value)
+    except Exception:
+        text = object.__repr__(value)
+
+    # `reprlib` limits the number of items of the containers, not the length of their reprs
+    return text if len(text) <= size else f"{text[: max(size - 3, 0)]}..."
+
+
+def _fingerprint(value: object) -> int | None:
+    try:
+        return hash(value)
+    except TypeError:
+        pass
+
+    import hashlib  # noqa: PLC0415 - only needed for unhashable buffers
+
+    try:
+        with memoryview(value) as view:  # type: ignore[arg-type]
+            return int.from_bytes(hashlib.blake2b(view, digest_size=8).digest())
+    except TypeError:
+        return None
+
+
+class WeakArg:
+    """Stand-in of a call argument referencing it weakly, it compares equal to the value while the value is alive."""
+
+    __slots__ = ("ref", "type_name")
+
+    def __init__(self, value: object) -> None:
+        self.ref = weakref.ref(value)
+        self.type_name = type(value).__qualname__
+
+    def __eq__(self, other: object) -> bool:
+        value = self.ref()
+        if isinstance(other, WeakArg):
+            other = other.ref()
+
+        if value is None:
+            return False
+
+        # Array-likes compare element-wise, their comparisons are not booleans
+        return value is other or bool(value == other)
+
+    def __hash__(self) -> int:
+        # The hash of the value, unhashable values stay unhashable
+        return hash(self.ref)
+
+    def __repr__(self) -> str:
+        value = self.ref()
+        return f"<collected {self.type_name}>" if value is None else repr(value)
+
+
+@dataclass(frozen=True, slots=True)
+class RecordPolicy:
+    """What the mocks keep from the calls, parsed from the `record` and `retain` options of `ykcom`.
+
+    `"full"` keeps every call, `"ring(N)"` the last N calls, `"counts"` only the number of calls per path and
+    `"summary"` keeps the calls with the reprs and hashes of the arguments instead of the arguments.
+
+    `retain` is how the arguments of the kept calls are referenced: `"full"` keeps them, `"weak"` keeps weak
+    references (small values which do not support them are kept, the larger ones are summarized) and `"repr(N)"`
+    keeps reprs of at most N characters with fingerprints.
+    """
+
+    mode: RecordMode = "full"
+    size: int = 0
+    retain: RetainMode = "full"
+    retain_size: int = 0
+
+    @classmethod
+    def parse(cls, record: str, retain: str = "full") -> RecordPolicy:
+        """Parse the `record` and `retain` options.
+
+        Raises:
+            UnknownRecordModeError: If the mode is not supported.
+            UnknownRetainPolicyError: If the retain policy is not supported.
+        """
+        retained: dict[str, Any]
+        if retain in ("full", "weak"):
+            retained = {"retain": retain}
+        elif match := _REPR_PATTERN.fullmatch(retain):
+            retained = {"retain": "repr", "retain_size": int(match.group(1))}
+        else:
+            raise UnknownRetainPolicyError(f"Unknown retain policy '{retain}'")
+
+        if record in ("full", "counts", "summary"):
+            return cls(mode=record, **retained)  # type: ignore[arg-type]
+        if match := _RING_PATTERN.fullmatch(record):
+            return cls(mode="ring", size=int(match.group(1)), **retained)
+
+        raise UnknownRecordModeError(f"Unknown record mode '{record}'")
+
+    @property
+    def is_default(self) -> bool:
+        return self.mode == "full" and self.retain == "full"
+
+    @property
+    def keeps_arguments(self) -> bool:
+        return self.mode != "summary" and self.retain == "full"
+
+    def retained(self, value: object) -> object:
+        """Return what is kept of a call argument."""
+        if self.mode == "summary":
+            return ArgSummary(value)
+        if self.retain == "repr":
+            return ArgSummary(value, self.retain_size)
+        if self.retain == "weak":
+            try:
+                return WeakArg(value)
+            except TypeError:
+                # Like int, str, tuple or bytes
+                return value if sys.getsizeof(value) <= _WEAK_FALLBACK_SIZE else ArgSummary(value)
+
+        return value
+
+    def retained_call(self, value: _Call) -> _Call:
+        """Return what is kept of a call recorded as (args, kwargs), like the awaits of `AsyncMock`."""
+        args, kwargs = value
+        return _Call(
+            (tuple(self.retained(a) for a in args), {k: self.retained(v) for k, v in kwargs.items()}),
+            two=True,
+        )
+
+    def new_list(self) -> _CallList:
+        if self.mode == "ring":
+            return RingCallList(self.size)
+        if self.mode == "counts":
+            return CountingCallList()
+
+        return _CallList()
+
+
+class _RecordingMixin:
+    _ykcom_policy: ClassVar[RecordPolicy]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        self._ykcom_install_lists()
+
+    def _ykcom_install_lists(self) -> None:
+        # The mocks replace the lists with plain ones on init and reset, the mocks skipped by a reset keep theirs
+        attributes = self.__dict__
+        if type(attributes["_mock_mock_calls"]) is _CallList and self._ykcom_policy.mode in ("ring", "counts"):
+            attributes["_mock_mock_calls"] = self._ykcom_policy.new_list()
+            attributes["_mock_call_args_list"] = self._ykcom_policy.new_list()
+            attributes["method_calls"] = self._ykcom_policy.new_list()
+
+    def reset_mock(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().reset_mock(*args, **kwargs)  # type: ignore[misc]
+        self._ykcom_install_lists()
+
+    def _increment_mock_call(self, /, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        policy = self._ykcom_policy
+        if not policy.keeps_arguments:
+            args = tuple(policy.retained(a) for a in args)
+            kwargs = {k: policy.retained(v) for k, v in kwargs.items()}
+
+        super()._increment_mock_call(*args, **kwargs)  # type: ignore[misc]
+
+
+class RetainingCallList(_CallList):
+    """Call list keeping the calls appended to it according to the retain policy of `policy`."""
+
+    def __init__(self, policy: RecordPolicy) -> None:
+        super().__init__()
+        self.policy = policy
+
+    def append(self, value: _Call) -> None:
+        super().append(self.policy.retained_call(value))
+
+
+# The property of `AsyncMock` (delegating to the autospecced functions), wrapped by `_AsyncRecordingMixin`
+_AWAIT_ARGS: Any = vars(AsyncMockMixin)["await_args"]
+
+
+class _AsyncRecordingMixin(_RecordingMixin):
+    """`AsyncMock` records the awaits with their arguments too, the retain policy applies to them as well."""
+
+    def _ykcom_install_lists(self) -> None:
+        super()._ykcom_install_lists()
+        attributes = self.__dict__
+        if type(attributes["_mock_await_args_list"]) is _CallList and not self._ykcom_policy.keeps_arguments:
+            attributes["_mock_await_args_list"] = RetainingCallList(self._ykcom_policy)
+
+    @property
+    def await_args(self) -> _Call | None:
+        return _AWAIT_ARGS.fget(self)  # type: ignore[no-any-return]
+
+    @await_args.setter
+    def await_args(self, value: _Call | None) -> None:
+        if value is not None and not self._ykcom_policy.keeps_arguments:
+            value = self._ykcom_policy.retained_call(value)
+
+        _AWAIT_ARGS.fset(self, value)
+
+
+_classes: dict[tuple[RecordPolicy, type[Any]], type[Any]] = {}
+
+
+def recording_class(policy: RecordPolicy, base: type[NonCallableMock]) -> type[Any]:
+    """Return the subclass of `base` recording the calls according to `policy`.
+
+    The children created by the mocks are of the same class (the children of `AsyncMock` are plain mocks).
+    """
+    if policy.is_default:
+        return base
+
+    key = (policy, base)
+    if key not in _classes:
+        retain = "" if policy.retain == "full" else policy.retain.capitalize()
+        name = f"{policy.mode.capitalize()}{retain}{base.__name__}"
+        mixin = _AsyncRecordingMixin if issubclass(base, AsyncMockMixin) else _RecordingMixin
+        _classes[key] = type(name, (mixin, base), {"_ykcom_policy": policy})
+
+    return _classes[key]
+
+
+class _RootMixin:
+    """The mock returned by `ykcom`: its calls are indexed by path and its children are plain recording mocks."""
+
+    _ykcom_child_class: ClassVar[type[Any]]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        self._ykcom_install_index()
+
+    def _ykcom_install_index(self) -> None:
+        # The bounded lists of the recording modes are kept, they are not indexed
+        attributes = self.__dict__
+        if type(attributes["_mock_mock_calls"]) is _CallList:
+            attributes["_mock_mock_calls"] = IndexedCallList()
+        if exporter := attributes.get("_ykcom_exporter"):
+            exporter.install(attributes["_mock_mock_calls"])
+
+    def _ykcom_export_to(self, exporter: CallExporter) -> None:
+        """Stream the calls recorded by this mock (and its children) to `exporter`."""
+        self.__dict__["_ykcom_exporter"] = exporter
+        exporter.install(self.__dict__["_mock_mock_calls"])
+
+    def reset_mock(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().reset_mock(*args, **kwargs)  # type: ignore[misc]
+        self._ykcom_install_index()
+
+    def assert_matches_snapshot(self, name: str | None = None) -> None:
+        """Compare the recorded calls with the snapshot of the running test, see `ykcom.snapshot`."""
+        from .snapshot import assert_matches_snapshot  # noqa: PLC0415 - optional, loaded on first use
+
+        assert_matches_snapshot(self.__dict__["_mock_mock_calls"], name)
+
+    def _get_child_mock(self, /, **kwargs: Any) -> Any:  # noqa: ANN401
+        # By default the children would be of the class of the parent
+        if kwargs.get("_new_name") in _ASYNC_MAGICS:
+            return AsyncMock(**kwargs)
+
+        return self._ykcom_child_class(**kwargs)
+
+
+def root_class(policy: RecordPolicy) -> type[MagicMock]:
+    """Return the class of the mock returned by `ykcom`."""
+    child_class = recording_class(policy, MagicMock)
+    key = (policy, _RootMixin)
+    if key not in _classes:
+        attributes = {"_ykcom_child_class": child_class}
+        _classes[key] = type(f"Root{child_class.__name__}", (_RootMixin, child_class), attributes)
+
+    return _classes[key]
@@ -0,0 +1,111 @@
+"""Per-thread registry of the active patches, shared by the activations patching the same attribute."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .engines import resolve_target
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .types import Patcher
+
+
+@dataclass(kw_only=True, slots=True)
+class _Layer:
+    """A value installed by the activations of one returned mock (`owner`), `count` is the number of activations."""
+
+    owner: object
+    value: object
+    count: int = 1
+
+
+@dataclass(kw_only=True, slots=True)
+class _Slot:
+    """An attribute patched by `patcher`, the last layer is the installed value."""
+
+    target: object
+    attribute: str
+    patcher: Patcher
+    layers: list[_Layer] = field(default_factory=list)
+
+
+_local = threading.local()
+
+
+def _slots() -> dict[tuple[int, str], _Slot]:
+    try:
+        return _local.slots  # type: ignore[no-any-return]
+    except AttributeError:
+        _local.slots = {}
+        return _local.slots  # type: ignore[no-any-return]
+
+
+def active_patches() -> int:
+    """Return the number of attributes patched in the current thread."""
+    return len(_slots())
+
+
+class CoalescingPatcher:
+    """Patcher sharing the patch of an attribute with the other activations of the current thread.
+
+    The first activation patches the attribute with `patcher`. The next activations of the same returned mock (`owner`)
+    reuse the installed value, the others install a value created by `factory` over it. The attribute is restored
+    by `patcher` when the last activation stops, in any order. The instance can be re-entered, every start is undone
+    by one stop.
+    """
+
+    __slots__ = ("_activations", "_factory", "_owner", "_patcher", "_target")
+
+    def __init__(self, patcher: Patcher, target: str, *, factory: Callable[[], object], owner: object) -> None:
+        self._patcher = patcher
+        self._target = target
+        self._factory = factory
+        self._owner = owner
+        # The slot key and the layer of every activation of this instance, the last one is stopped first
+        self._activations: list[tuple[tuple[int, str], _Layer]] = []
+
+    def start(self) -> Any:  # noqa: ANN401
+        target, attribute = resolve_target(self._target)
+        key = (id(target), attribute)
+        slots = _slots()
+        slot = slots.get(key)
+
+        if slot is None:
+            # Nothing is registered before the patch succeeds
+            value = self._patcher.start()
+            slot = slots[key] = _Slot(target=target, attribute=attribute, patcher=self._patcher)
+            layer = _Layer(owner=self._owner, value=value)
+            slot.layers.append(layer)
+        elif slot.layers[-1].owner is self._owner:
+            layer = slot.layers[-1]
+            layer.count += 1
+        else:
+            layer = _Layer(owner=self._owner, value=self._factory())
+            setattr(target, attribute, layer.value)
+            slot.layers.append(layer)
+
+        self._activations.append((key, layer))
+        return layer.value
+
+    def stop(self) -> None:
+        if not self._activations:
+            return
+
+        key, layer = self._activations.pop()
+        layer.count -= 1
+        if layer.count:
+            return
+
+        slots = _slots()
+        slot = slots[key]
+        is_top = slot.layers[-1] is layer
+        slot.layers.remove(layer)
+        if not slot.layers:
+            del slots[key]
+            slot.patcher.stop()
+        elif is_top:
+            setattr(slot.target, slot.attribute, slot.layers[-1].value)
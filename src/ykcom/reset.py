@@ -0,0 +1,72 @@
+"""Strategies to reset the mock between the runs."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+from unittest.mock import NonCallableMock
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+ResetStrategy = Literal["full", "touched", "fresh"]
+
+
+def _reset_shallow(mock: NonCallableMock) -> None:
+    """Reset the calls recorded by `mock` without descending into its children."""
+    # `reset_mock` skips the mocks already visited, listing the children prevents the recursion
+    visited = [id(child) for child in mock._mock_children.values()]
+    visited.append(id(mock._mock_return_value))
+    mock.reset_mock(visited)
+
+
+def _segments(path: str) -> list[tuple[str, int]]:
+    """Split a call path like `"os.path.join().upper"` into (attribute, number of calls) pairs."""
+    segments = []
+    for segment in path.split(".") if path else []:
+        attribute = segment.rstrip("()")
+        segments.append((attribute, (len(segment) - len(attribute)) // 2))
+
+    return segments
+
+
+def touched_paths(root: NonCallableMock) -> set[str]:
+    """Return the distinct paths of the calls recorded on `root` since the last reset."""
+    # The bounded call lists of the recording modes keep track of the paths themselves
+    paths: set[str] | None = getattr(root.mock_calls, "paths", None)
+    if paths is not None:
+        return paths
+
+    return {c[0] for c in root.mock_calls}
+
+
+def _nodes_on_path(root: NonCallableMock, path: str) -> Iterator[NonCallableMock]:
+    node: object = root
+    for attribute, calls in _segments(path):
+        if attribute:
+            node = node._mock_children.get(attribute)  # type: ignore[attr-defined]
+            if not isinstance(node, NonCallableMock):
+                return
+            yield node
+
+        for _ in range(calls):
+            node = node._mock_return_value  # type: ignore[attr-defined]
+            if not isinstance(node, NonCallableMock):
+                return
+            yield node
+
+
+def reset_touched(root: NonCallableMock) -> int:
+    """Reset only the mocks that recorded a call since the last reset, return the number of mocks reset.
+
+    Every call is recorded on the called mock and on all of its ancestors, so following the paths of the calls
+    recorded on `root` finds every mock holding a call. The other mocks of the tree are not visited.
+    """
+    nodes = {id(root): root}
+    for path in touched_paths(root):
+        for node in _nodes_on_path(root, path):
+            nodes[id(node)] = node
+
+    for node in nodes.values():
+        _reset_shallow(node)
+
+    return len(nodes)
@@ -0,0 +1,64 @@
+"""Patches kept active for a whole pytest scope."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from unittest.mock import MagicMock
+
+    from _pytest.nodes import Node
+
+    from .ykcom import ykcom
+
+Scope = Literal["class", "module", "package", "session"]
+
+_SCOPE_ORDER: list[Scope] = ["class", "module", "package", "session"]
+
+
+def _scope_node(request: pytest.FixtureRequest, scope: Scope) -> Node:
+    """Find the collection node of `scope`, falling back to the enclosing scopes (like a class-less test)."""
+    node_types: dict[Scope, type[Node]] = {"class": pytest.Class, "module": pytest.Module, "package": pytest.Package}
+    test: Node = request.node
+    for s in _SCOPE_ORDER[_SCOPE_ORDER.index(scope) :]:
+        if s in node_types and (node := test.getparent(node_types[s])) is not None:
+            return node
+
+    return request.session
+
+
+def scoped_fixture(
+    instance: ykcom,
+    *,
+    scope: Scope,
+    autouse: bool,
+) -> Callable[[pytest.FixtureRequest], Iterator[MagicMock]]:
+    """Create a function scoped fixture that keeps the targets of `instance` patched for the whole `scope`.
+
+    The targets are patched when the fixture is first requested in the scope and restored when the scope is torn
+    down. Between the tests only the mock is reset.
+    """
+    active = False
+
+    def stop() -> None:
+        nonlocal active
+        active = False
+        instance._stop()
+
+    @pytest.fixture(autouse=autouse)
+    def fixture(request: pytest.FixtureRequest) -> Iterator[MagicMock]:
+        nonlocal active
+        if not active:
+            instance._start()
+            active = True
+            _scope_node(request, scope).addfinalizer(stop)
+
+        try:
+            yield instance._mock_data.mock
+        finally:
+            instance._reset(configuration=True)
+
+    return fixture
@@ -0,0 +1,108 @@
+"""Snapshots of the calls recorded by a mock, stored as text files next to the tests."""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import os
+import re
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from unittest.mock import _Call
+
+    import pytest
+
+SNAPSHOT_DIRECTORY = "__snapshots__"
+UPDATE_VARIABLE = "YKCOM_UPDATE_SNAPSHOTS"
+
+_HEADER = "# ykcom snapshot sha256={digest} calls={count}\n"
+_VOLATILE = re.compile(r"(?<= id=')\d+|(?<= at 0x)[0-9a-fA-F]+")
+_UNSAFE = re.compile(r"[^\w.\[\]-]")
+
+
+def _session_config() -> pytest.Config | None:
+    """Return the configuration of the pytest session, kept by the plugin: the root of the node ids and the options."""
+    plugin = sys.modules.get(f"{__package__}.pytest_plugin")
+    return None if plugin is None else plugin.session_config
+
+
+def serialize(calls: list[_Call]) -> str:
+    """Return the calls one per line, the object ids and addresses are replaced to get the same text on every run."""
+    return "".join(_VOLATILE.sub("<id>", repr(c)) + "\n" for c in calls)
+
+
+def _header(text: str) -> str:
+    return _HEADER.format(digest=hashlib.sha256(text.encode()).hexdigest(), count=text.count("\n"))
+
+
+def snapshot_path(name: str | None = None) -> Path:
+    """Return the path of the snapshot of the running test: `__snapshots__/<test module>/<test>[.<name>].calls`.
+
+    Outside of a test the snapshots are in `__snapshots__` of the current directory and `name` is required.
+    """
+    test = os.environ.get("PYTEST_CURRENT_TEST")
+    if test is None:
+        if name is None:
+            raise ValueError("The snapshot must be named outside of pytest tests")
+
+        return Path.cwd() / SNAPSHOT_DIRECTORY / f"{_UNSAFE.sub('_', name)}.calls"
+
+    # Like "tests/test_a.py::TestB::test_c[1] (call)"
+    module, _, function = test.rpartition(" ")[0].partition("::")
+    config = _session_config()
+    module_path = (Path.cwd() if config is None else config.rootpath) / module
+    stem = _UNSAFE.sub("_", function.replace("::", "."))
+    if name is not None:
+        stem = f"{stem}.{_UNSAFE.sub('_', name)}"
+
+    return module_path.parent / SNAPSHOT_DIRECTORY / module_path.stem / f"{stem}.calls"
+
+
+def _update_mode() -> bool:
+    config = _session_config()
+    if config is not None and config.getoption("ykcom_update_snapshots"):
+        return True
+
+    return os.environ.get(UPDATE_VARIABLE, "") not in ("", "0")
+
+
+def assert_matches_snapshot(calls: list[_Call], name: str | None = None) -> None:
+    """Compare `calls` with the stored snapshot, or store them in update mode.
+
+    The hashes in the headers are compared first, the snapshot is only diffed when they differ.
+
+    Raises:
+        AssertionError: If the calls differ from the snapshot or the snapshot does not exist.
+    """
+    path = snapshot_path(name)
+    text = serialize(calls)
+    header = _header(text)
+
+    try:
+        with path.open(encoding="utf-8") as file:
+            stored_header = file.readline()
+            if stored_header == header:
+                return
+
+            stored = file.read()
+    except FileNotFoundError:
+        if not _update_mode():
+            raise AssertionError(f"Snapshot {path} does not exist, set {UPDATE_VARIABLE}=1 to create it") from None
+        stored = None
+
+    if _update_mode():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(header + text, encoding="utf-8")
+        return
+
+    diff = difflib.unified_diff(
+        stored.splitlines(),  # type: ignore[union-attr]
+        text.splitlines(),
+        fromfile=str(path),
+        tofile="recorded calls",
+        lineterm="",
+    )
+    raise AssertionError("The calls differ from the snapshot:\n" + "\n".join(diff))
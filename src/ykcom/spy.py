@@ -0,0 +1,128 @@
+"""Spies: thin proxies recording the calls to the real objects into the call log of the returned mock."""
+
+from __future__ import annotations
+
+import operator
+import os
+from types import MethodType
+from typing import TYPE_CHECKING, Any
+from unittest.mock import _Call
+
+from .context import ContextDispatcher
+from .engines import resolve_target
+from .proxy import _FORWARDED_MAGICS, ForwardingProxy
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from unittest.mock import MagicMock
+
+    from .recording import RecordPolicy
+
+# Conversions, mostly done implicitly (by `if`, f-strings, logging...): they are not recorded. Done with the builtins,
+# which fall back on the other protocols (like `bool` on `__len__`)
+_CONVERSIONS: dict[str, Callable[[Any], object]] = {
+    "__bool__": bool,
+    "__float__": float,
+    "__fspath__": os.fspath,
+    "__index__": operator.index,
+    "__int__": int,
+    "__len__": len,
+    "__str__": str,
+}
+
+
+class Spy(ForwardingProxy):
+    """Record the calls to `original` under `path` on `root` and call through.
+
+    Attributes which are callable or have a `__dict__` (modules, classes, functions, objects) are spied as well, plain
+    data (like strings, numbers and containers) is returned as is. The return values of the calls are not spied.
+    The conversions (like `bool`, `str` and `len`) are not recorded.
+    """
+
+    __slots__ = ("_children", "_original", "_path", "_policy", "_root")
+
+    def __init__(self, root: MagicMock, path: str, original: object) -> None:
+        self._root = root
+        self._path = path
+        self._original = original
+        self._children: dict[str, Spy] = {}
+        # Only set when the arguments are not kept as they are
+        self._policy: RecordPolicy | None = getattr(type(root), "_ykcom_policy", None)
+
+    def _log(self, path: str, args: tuple[object, ...], kwargs: dict[str, object]) -> None:
+        if self._policy is not None:
+            args = tuple(self._policy.retained(a) for a in args)
+            kwargs = {k: self._policy.retained(v) for k, v in kwargs.items()}
+
+        self._root.mock_calls.append(_Call((path, args, kwargs)))
+
+    def _resolve(self) -> Any:  # noqa: ANN401
+        return self._original
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        value = getattr(self._original, name)
+        if not callable(value) and not hasattr(value, "__dict__"):
+            return value
+
+        child = self._children.get(name)
+        if child is None or not _same(child._original, value):
+            child = self._children[name] = Spy(self._root, f"{self._path}.{name}", value)
+
+        return child
+
+    def __call__(self, *args: object, **kwargs: object) -> Any:  # noqa: ANN401
+        self._log(self._path, args, kwargs)
+
+        return self._original(*args, **kwargs)  # type: ignore[operator]
+
+    def __repr__(self) -> str:
+        return f"<Spy {self._path!r} of {self._original!r}>"
+
+
+def _same(spied: object, value: object) -> bool:
+    """Compare by identity: the values may compare in any way (or raise, like the arrays)."""
+    if spied is value:
+        return True
+
+    # Bound methods are created on every access: the same function bound to the same object
+    return (
+        isinstance(spied, MethodType)
+        and isinstance(value, MethodType)
+        and spied.__self__ is value.__self__
+        and spied.__func__ is value.__func__
+    )
+
+
+def _record(name: str) -> Callable[..., Any]:
+    def method(self: Spy, *args: object, **kwargs: object) -> Any:  # noqa: ANN401
+        self._log(f"{self._path}.{name}", args, kwargs)
+
+        return getattr(self._original, name)(*args, **kwargs)
+
+    method.__name__ = name
+    return method
+
+
+def _convert(name: str, conversion: Callable[[Any], object]) -> Callable[[Spy], Any]:
+    def method(self: Spy) -> Any:  # noqa: ANN401
+        return conversion(self._original)
+
+    method.__name__ = name
+    return method
+
+
+for _name in _FORWARDED_MAGICS:
+    if _name in _CONVERSIONS:
+        setattr(Spy, _name, _convert(_name, _CONVERSIONS[_name]))
+    else:
+        setattr(Spy, _name, _record(_name))
+
+
+def spy(root: MagicMock, name: str, target: str) -> Spy:
+    """Return a spy of the current value of `target`, recording under `name` on `root`."""
+    owner, attribute = resolve_target(target)
+    original = getattr(owner, attribute)
+    if isinstance(original, ContextDispatcher):
+        original = original._original
+
+    return Spy(root, name, original)
@@ -1,12 +1,30 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Protocol
+from typing import TYPE_CHECKING, Protocol, TypedDict
 
 if TYPE_CHECKING:
+    import os
     from unittest.mock import MagicMock
 
+    from .engines import Engine
+    from .reset import ResetStrategy
+
 
 class Patcher(Protocol):
     def start(self) -> MagicMock: ...
 
     def stop(self) -> None: ...
+
+
+class Options(TypedDict, total=False):
+    """Options of `ykcom` shared by the decorator, the context manager and the fixtures."""
+
+    engine: Engine
+    async_children: bool
+    lazy: bool
+    reset: ResetStrategy
+    record: str
+    autospec: bool
+    spy: bool
+    export: str | os.PathLike[str] | None
+    retain: str
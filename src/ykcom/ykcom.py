@@ -2,23 +2,42 @@
 
 from __future__ import annotations
 
+import copy
 import inspect
+import os
+import sys
+import time
 from collections.abc import Callable, Iterable
-from dataclasses import dataclass, field
-from functools import wraps
-from typing import TYPE_CHECKING, ParamSpec, TypeVar
-from unittest.mock import MagicMock, patch
+from contextlib import suppress
+from dataclasses import dataclass, field, replace
+from functools import partial, wraps
+from typing import TYPE_CHECKING, ParamSpec, TypeVar, Unpack, overload
+from unittest.mock import AsyncMock, MagicMock
 
+from .engines import is_coroutine_target, make_patcher
 from .errors import NameCollisionError, NamedParameterNotFoundError, TargetAlreadyBoundError
+from .index import ALL_IMPORTED_MODULES, expand
+from .proxy import LazyChild
+from .recording import RecordPolicy, recording_class, root_class
+from .registry import CoalescingPatcher
+from .reset import reset_touched
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from types import TracebackType
 
-    from .types import Patcher
+    import pytest
+
+    from .engines import Engine
+    from .instrumentation import Recorder
+    from .reset import ResetStrategy
+    from .scoped import Scope
+    from .types import Options, Patcher
 
 MockTarget = str | Iterable[str]
 P = ParamSpec("P")
 T = TypeVar("T")
+C = TypeVar("C", bound=type)
 
 
 @dataclass(frozen=True, kw_only=True, slots=True)
@@ -37,6 +56,26 @@ class MockData:
 class YkcomData:
     named: dict[str | None, MockData] = field(default_factory=dict)
     targets: dict[str, str | None] = field(default_factory=dict)
+    mock_names: dict[tuple[str | None, str], str] = field(default_factory=dict)
+
+    def register_mock_name(self, target: str, mock_name: str, *, name: str | None) -> None:
+        """Register the name under which the target is accessible. Each name should refer to one target per Ykcom name.
+
+        Args:
+            target: The target the name refers to.
+            mock_name: The name of the attribute on the mock.
+            name: The name of the Ykcom instance to register.
+
+        Raises:
+            NameCollisionError: If the name is already used for a different target.
+        """
+        if self.mock_names.setdefault((name, mock_name), target) != target:
+            error_msg = (
+                f"'{mock_name}' is already used for '{name}'"
+                if name
+                else f"'{mock_name}' is already used for positional instance"
+            )
+            raise NameCollisionError(error_msg)
 
     def register_target(self, target: str, *, name: str | None) -> None:
         """Register the given target to Ykcom. Each target should only be registered once per Ykcom name.
@@ -54,80 +93,222 @@ class YkcomData:
         self.targets[target] = name
 
 
+@dataclass(frozen=True, kw_only=True, slots=True)
+class InvocationPlan:
+    """Per-call behavior of a decorated function, compiled once at decoration time.
+
+    `data` is the merged `YkcomData` of the stacked decorators. `name` is set for named instances, `slot` is the
+    positional index where the mock is spliced into the arguments, `None` when nothing is injected positionally.
+    """
+
+    mock: MagicMock
+    data: YkcomData
+    name: str | None = None
+    slot: int | None = None
+    is_method: bool = False
+    is_async: bool = False
+
+    def inject(
+        self,
+        args: tuple[object, ...],
+        kwargs: dict[str, object],
+    ) -> tuple[tuple[object, ...], dict[str, object]]:
+        """Return the call arguments with the mock injected."""
+        if self.name:
+            kwargs[self.name] = self.mock
+        elif self.slot is not None:
+            args = (*args[: self.slot], self.mock, *args[self.slot :])
+
+        return args, kwargs
+
+
+def _recorder() -> Recorder | None:
+    """Return the timing recorder, the instrumentation is not imported unless it has been enabled."""
+    instrumentation = sys.modules.get(f"{__package__}.instrumentation")
+    return None if instrumentation is None else instrumentation.recorder
+
+
 def _to_list(t: MockTarget) -> list[str]:
     """Convert the given mock target to a list of strings."""
     return [t] if isinstance(t, str) else list(t)
 
 
 class ykcom:  # noqa: N801
-    def __init__(self, base_path: str, target: MockTarget, *args: MockTarget, name: str | None = None) -> None:
+    ALL_IMPORTED_MODULES = ALL_IMPORTED_MODULES
+
+    def __init__(  # noqa: PLR0913
+        self,
+        base_path: str,
+        target: MockTarget,
+        *args: MockTarget,
+        name: str | None = None,
+        engine: Engine = "patch",
+        async_children: bool = True,
+        lazy: bool = False,
+        reset: ResetStrategy = "full",
+        record: str = "full",
+        autospec: bool = False,
+        spy: bool = False,
+        export: str | os.PathLike[str] | None = None,
+        retain: str = "full",
+    ) -> None:
         self._target = _to_list(target)
         self._name = name
+        self._engine = engine
+        self._async_children = async_children
+        self._lazy = lazy
+        self._reset_strategy = reset
+        self._autospec = autospec
+        self._spy = spy
+        self._mock_classes: list[type[MagicMock | AsyncMock]] | None = None
         self._patchers: list[Patcher] = []
-        self._mock_data = MockData()
+        self._spec_size = 0
+        self._record = RecordPolicy.parse(record, retain)
+        self._mock_data = MockData(mock=root_class(self._record)())
+        export = export or os.environ.get("YKCOM_EXPORT")
+        self._exporter = None
+        if export:
+            from .export import exporter_for  # noqa: PLC0415 - optional, loaded on first use
+
+            self._exporter = exporter_for(export)
+            self._mock_data.mock._ykcom_export_to(self._exporter)
 
         for arg in args:
             self._target.extend(_to_list(arg))
 
-        self._target = [t if "." in t else f"{base_path}.{t}" for t in self._target]
+        self._target = [e for t in self._target for e in expand(t if "." in t else f"{base_path}.{t}")]
+        self._names = [t.split(".")[-1] for t in self._target]
+
+    @classmethod
+    def fixture(
+        cls,
+        base_path: str,
+        target: MockTarget,
+        *args: MockTarget,
+        scope: Scope = "module",
+        autouse: bool = False,
+        **options: Unpack[Options],
+    ) -> Callable[[pytest.FixtureRequest], Iterator[MagicMock]]:
+        """Create a pytest fixture keeping the targets patched for the whole `scope`.
+
+        The fixture is named after the variable it is assigned to and returns the mock. The patches are started once
+        per scope, between the tests the mock is reset (including the configured return values and side effects).
+
+        ```python
+        mocked = ykcom.fixture("base_path", "os", scope="module")
+
+
+        def test_something(mocked: MagicMock) -> None: ...
+        ```
+        """
+        from .scoped import scoped_fixture  # noqa: PLC0415 - pytest is only needed when fixtures are used
+
+        return scoped_fixture(cls(base_path, target, *args, **options), scope=scope, autouse=autouse)
+
+    @overload
+    def __call__(self, func: C) -> C: ...
 
-    def __call__(self, func: Callable[P, T]) -> Callable[P, T]:
+    @overload
+    def __call__(self, func: Callable[P, T]) -> Callable[P, T]: ...
+
+    def __call__(self, func: C | Callable[P, T]) -> C | Callable[P, T]:
+        if isinstance(func, type):
+            return self._decorate_class(func)
+
+        return self._decorate_function(func)
+
+    def _decorate_class(self, cls: C) -> C:
+        """Decorate every test method of `cls`.
+
+        The methods share this instance: the targets are resolved, the patchers created and the spec applied once for
+        the whole class. Methods that already have a mock with the same name keep using it.
+        """
+        # Resolving the targets might fail here, then it is retried (and fails) on start
+        with suppress(ImportError, AttributeError):
+            self._mock_classes = self._detect_mock_classes()
+
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("test") and inspect.isfunction(value):
+                setattr(cls, attr, self._decorate_function(value))
+
+        return cls
+
+    def _decorate_function(self, func: Callable[P, T]) -> Callable[P, T]:
         data = getattr(func, "_ykcom", None)
         if not data:
             data = func._ykcom = YkcomData()  # type: ignore[attr-defined]
 
         if other := data.named.get(self._name):
-            self._mock_data = other
+            instance = self._bind(other)
             mock_reused = True
         else:
+            instance = self
             data.named[self._name] = self._mock_data
             mock_reused = False
 
-        for t in self._target:
-            mock_name = t.split(".")[-1]
-            if mock_name in self._mock_data.specs and t not in data.targets:
-                error_msg = (
-                    f"'{mock_name}' is already used for '{self._name}'"
-                    if self._name
-                    else f"'{mock_name}' is already used for positional instance"
-                )
-                raise NameCollisionError(error_msg)
-            self._mock_data.specs.add(mock_name)
+        for t, mock_name in zip(self._target, self._names, strict=True):
+            data.register_mock_name(t, mock_name, name=self._name)
+            instance._mock_data.specs.add(mock_name)
 
             data.register_target(t, name=self._name)
 
-        if self._name:
-            self._update_signature_with_named_default(func)
+        plan = instance._compile_plan(func, data, mock_reused=mock_reused)
+
+        if self._mock_classes is None:
+            # Resolving the targets might fail here, then it is retried (and fails) on start
+            with suppress(ImportError, AttributeError):
+                self._mock_classes = instance._mock_classes = self._detect_mock_classes()
+
+        if plan.is_async:
+            wrapper = instance._wrap_coroutine_function(func, plan)
         else:
-            self._update_signature_with_positional_default(func)
 
-        @wraps(func)
-        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-            if self._name:
-                kwargs.update({self._name: self._mock_data.mock})
-            elif not mock_reused:
-                # Keep using the same positional mock
-                if self._is_likely_method(func):
-                    args = (args[0], self._mock_data.mock, *args[1:])  # type: ignore[assignment]
-                else:
-                    args = (self._mock_data.mock, *args)  # type: ignore[assignment]
+            @wraps(func)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                args, kwargs = plan.inject(args, kwargs)  # type: ignore[assignment]
 
-            try:
-                self._start()
-                return func(*args, **kwargs)
-            finally:
-                self._stop()
-                func._ykcom = None  # type: ignore[attr-defined]
+                instance._start()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    instance._stop()
+                    func._ykcom = None  # type: ignore[attr-defined]
 
         wrapper._ykcom = data  # type: ignore[attr-defined]
+        wrapper._ykcom_plan = plan  # type: ignore[attr-defined]
 
         # TODO test for standalone function
         # TODO test for multiple decorators
-        # TODO handle classes
         # TODO check behavior on failed tests
-        # TODO async
         return wrapper
 
+    def _bind(self, mock_data: MockData) -> ykcom:
+        """Return a copy of this instance recording into `mock_data`, sharing the resolved targets."""
+        instance = copy.copy(self)
+        instance._mock_data = mock_data
+        instance._patchers = []
+        instance._spec_size = 0
+        if self._exporter is not None:
+            mock_data.mock._ykcom_export_to(self._exporter)
+
+        return instance
+
+    def _wrap_coroutine_function(self, func: Callable[P, T], plan: InvocationPlan) -> Callable[P, T]:
+        """Wrap a coroutine function, the patches are active while the coroutine is awaited."""
+
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> object:
+            args, kwargs = plan.inject(args, kwargs)  # type: ignore[assignment]
+
+            self._start()
+            try:
+                return await func(*args, **kwargs)  # type: ignore[misc]
+            finally:
+                self._stop()
+                func._ykcom = None  # type: ignore[attr-defined]
+
+        return wrapper  # type: ignore[return-value]
+
     def __enter__(self) -> MagicMock:
         self._start()
 
@@ -141,31 +322,205 @@ class ykcom:  # noqa: N801
     ) -> None:
         self._stop()
 
-    def _start(self) -> None:
-        for t in self._target:
-            name = t.split(".")[-1]
+    async def __aenter__(self) -> MagicMock:
+        return self.__enter__()
 
-            self._patchers.append(patch(t))
-            self._mock_data.specs.add(name)
-            self._mock_data.mock.mock_add_spec(list(self._mock_data.specs), spec_set=True)
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.__exit__(exc_type, exc_val, exc_tb)
 
-            new_mock = self._patchers[-1].start()
-            setattr(self._mock_data.mock, name, new_mock)
-            self._mock_data.mock.attach_mock(new_mock, name)
+    def _start(self) -> None:
+        specs = self._mock_data.specs
+        specs.update(self._names)
+
+        mock = self._mock_data.mock
+        if len(specs) != self._spec_size:
+            # The set of names only grows, applying it once per change is enough
+            mock.mock_add_spec(list(specs), spec_set=True)
+            self._spec_size = len(specs)
+
+        if not self._patchers:
+            self._patchers = self._create_patchers()
+
+        started: list[Patcher] = []
+        try:
+            for name, patcher in zip(self._names, self._patchers, strict=True):
+                new_mock = patcher.start()
+                started.append(patcher)
+                if isinstance(new_mock, LazyChild):
+                    # Attached to the parent on first use
+                    continue
+                if self._spy:
+                    # Not a mock, it is only reachable from the parent (the calls are recorded there)
+                    object.__setattr__(mock, name, new_mock)
+                    continue
+
+                if mock._mock_children.get(name) is not new_mock:
+                    setattr(mock, name, new_mock)
+                    mock.attach_mock(new_mock, name)
+        except BaseException:
+            # All or nothing: undo the targets patched so far
+            self._stop_patchers(started)
+            self._release_children()
+            raise
+
+    def _create_patchers(self) -> list[Patcher]:
+        if self._mock_classes is None:
+            self._mock_classes = self._detect_mock_classes()
+
+        recorder = _recorder()
+        if recorder is None:
+            return [
+                self._make_patcher(t, name, c)
+                for t, name, c in zip(self._target, self._names, self._mock_classes, strict=True)
+            ]
+
+        from .instrumentation import TimedPatcher  # noqa: PLC0415 - already imported by enabling it
+
+        patchers: list[Patcher] = []
+        for t, name, c in zip(self._target, self._names, self._mock_classes, strict=True):
+            begin = time.perf_counter()
+            patcher = self._make_patcher(t, name, c)
+            recorder.record("resolve", t, time.perf_counter() - begin)
+            patchers.append(TimedPatcher(patcher, t))
+
+        return patchers
+
+    def _make_patcher(self, target: str, name: str, mock_class: type[MagicMock | AsyncMock]) -> Patcher:
+        factory = self._child_factory(target, name, mock_class)
+        patcher = make_patcher(self._engine, target, new_callable=factory)
+        if self._engine == "context":
+            # Already isolated per context, the contexts must not share their patches
+            return patcher
+
+        return CoalescingPatcher(patcher, target, factory=factory, owner=self._mock_data)
+
+    def _child_factory(self, target: str, name: str, mock_class: type[MagicMock | AsyncMock]) -> Callable[[], object]:
+        """Return the factory of the object replacing `target`."""
+        if self._spy:
+            from .spy import spy  # noqa: PLC0415 - optional, loaded on first use
+
+            return partial(spy, self._mock_data.mock, name, target)
+
+        if self._autospec:
+            from .autospec import acquire  # noqa: PLC0415 - optional, loaded on first use
+
+            return partial(acquire, target)
+
+        if self._lazy and mock_class is MagicMock:
+            return partial(LazyChild, self._mock_data.mock, name, target)
+
+        mock_class = recording_class(self._record, mock_class)
+        if self._reset_strategy == "touched":
+            # The same child is kept for every run, only the touched part of its tree is reset
+            child = mock_class()
+            return lambda: child
+
+        return mock_class
+
+    def _detect_mock_classes(self) -> list[type[MagicMock | AsyncMock]]:
+        """Pick the mock type for each target: coroutine functions get `AsyncMock` if `async_children` is set."""
+        if not self._async_children:
+            return [MagicMock] * len(self._target)
+
+        return [AsyncMock if is_coroutine_target(t) else MagicMock for t in self._target]
 
     def _stop(self) -> None:
-        for patcher in self._patchers:
-            patcher.stop()
+        recorder = _recorder()
+        if recorder is not None:
+            from .instrumentation import count_nodes, retained_bytes  # noqa: PLC0415 - already imported by enabling it
+
+            children = self._mock_data.mock._mock_children
+            retained = retained_bytes(self._mock_data.mock.mock_calls)
+            for target, name in zip(self._target, self._names, strict=True):
+                recorder.record_nodes(target, count_nodes(children.get(name)))
+                recorder.record_retained(target, retained.get(name, 0))
+
+        self._stop_patchers(self._patchers)
+        self._release_children()
+        if self._exporter is not None:
+            self._exporter.flush()
 
         # Must reset the mocks. The same `_mock_data` object is being reused when used with `pytest.mark.parametrize`.
-        self._mock_data.mock.reset_mock()
-        for name in self._mock_data.specs:
-            getattr(self._mock_data.mock, name).reset_mock()
+        if recorder is None:
+            self._reset()
+            return
+
+        begin = time.perf_counter()
+        self._reset()
+        # The mock is reset as a whole, the time is shared between the targets
+        share = (time.perf_counter() - begin) / len(self._target)
+        for target in self._target:
+            recorder.record("reset", target, share)
+
+    def _reset(self, *, configuration: bool = False) -> None:
+        """Reset the recorded calls. With `configuration` the return values and side effects are reset as well."""
+        mock = self._mock_data.mock
+        if configuration:
+            # Between the tests of a scoped fixture the patches stay active, the patched owners keep referencing the
+            # children: they are reset in place
+            mock.reset_mock(return_value=True, side_effect=True)
+            return
+
+        if self._lazy or self._reset_strategy == "fresh":
+            # Drop the children of the run, the next run starts with fresh ones and the tree is not walked.
+            # Untouched lazy targets do not cost anything.
+            children = mock._mock_children
+            for name in self._names:
+                children.pop(name, None)
+        elif self._reset_strategy == "touched":
+            reset_touched(mock)
+            return
+
+        mock.reset_mock()
+
+    def _release_children(self) -> None:
+        """Detach the autospecced children and return them to their pools, the root reset does not walk them."""
+        if not self._autospec:
+            return
+
+        from .autospec import release  # noqa: PLC0415 - loaded by `_child_factory`
+
+        children = self._mock_data.mock._mock_children
+        for name in self._names:
+            release(children.pop(name, None))
+
+    @staticmethod
+    def _stop_patchers(patchers: list[Patcher]) -> None:
+        # Reverse order restores the original values even if a target is patched multiple times
+        for patcher in reversed(patchers):
+            patcher.stop()
+
+    def _compile_plan(self, func: Callable[P, T], data: YkcomData, *, mock_reused: bool) -> InvocationPlan:
+        """Inspect `func` once and rewrite its signature, returning the plan used by every call of the wrapper."""
+        signature = inspect.signature(func)
+        is_method = self._is_likely_method(signature)
+        plan = InvocationPlan(
+            mock=self._mock_data.mock,
+            data=data,
+            is_method=is_method,
+            is_async=inspect.iscoroutinefunction(func),
+        )
+
+        if self._name:
+            self._update_signature_with_named_default(func, signature)
+            return replace(plan, name=self._name)
+
+        if mock_reused:
+            # The inner decorator already moved the parameter and injects the shared mock
+            return plan
 
-    def _update_signature_with_named_default(self, func: Callable[P, T]) -> None:
+        self._update_signature_with_positional_default(func, signature, is_method=is_method)
+        return replace(plan, slot=int(is_method))
+
+    def _update_signature_with_named_default(self, func: Callable[P, T], signature: inspect.Signature) -> None:
         new_params = []
         new_with_default = None
-        for name, param in inspect.signature(func).parameters.items():
+        for name, param in signature.parameters.items():
             if name == self._name:
                 new_with_default = param.replace(default=self._mock_data.mock)
             else:
@@ -176,22 +531,29 @@ class ykcom:  # noqa: N801
 
         new_params.append(new_with_default)
 
-        func.__signature__ = inspect.signature(func).replace(parameters=new_params)  # type: ignore[attr-defined]
+        func.__signature__ = signature.replace(parameters=new_params)  # type: ignore[attr-defined]
 
-    def _update_signature_with_positional_default(self, func: Callable[P, T]) -> None:
-        params = list(inspect.signature(func).parameters.values())
+    def _update_signature_with_positional_default(
+        self,
+        func: Callable[P, T],
+        signature: inspect.Signature,
+        *,
+        is_method: bool,
+    ) -> None:
+        params = list(signature.parameters.values())
 
-        if self._is_likely_method(func):
-            new_params = params[:1] + params[2:] + [params[1].replace(default=self._mock_data.mock)]
+        if is_method:
+            new_params = [*params[:1], *params[2:], params[1].replace(default=self._mock_data.mock)]
         else:
-            new_params = params[1:] + [params[0].replace(default=self._mock_data.mock)]
+            new_params = [*params[1:], params[0].replace(default=self._mock_data.mock)]
 
-        func.__signature__ = inspect.signature(func).replace(parameters=new_params)  # type: ignore[attr-defined]
+        func.__signature__ = signature.replace(parameters=new_params)  # type: ignore[attr-defined]
 
-    @classmethod
-    def _is_likely_method(cls, func: Callable[P, T]) -> bool:
+    @staticmethod
+    def _is_likely_method(signature: inspect.Signature) -> bool:
         # TODO implement a more robust check
-        return next(iter(inspect.signature(func).parameters.values())).name == "self"
+        first = next(iter(signature.parameters.values()), None)
+        return first is not None and first.name == "self"
 
 
 # TODO define overload to mock without base path
@@ -0,0 +1,15 @@
+import asyncio
+import sys
+
+
+async def load(key: str) -> str:
+    await asyncio.sleep(0)
+
+    return key.upper()
+
+
+async def mock_me_async(key: str) -> str:
+    await asyncio.sleep(0)
+    sys.stdout.write("Some text\n")
+
+    return await load(key)
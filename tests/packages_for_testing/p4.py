@@ -0,0 +1,16 @@
+import json
+import os
+
+
+class Client:
+    def fetch(self, key: str) -> str:
+        return key
+
+
+client_a = Client()
+client_b = Client()
+other = Client()
+
+
+def fetch_all(key: str) -> str:
+    return json.dumps([client_a.fetch(key), client_b.fetch(key), os.environ.get(key)])
@@ -28,3 +28,17 @@ class TestAsContextManager:
                 call.sys.stdout.write("Some text\n"),
                 call.os.environ.__getitem__("none"),
             ]
+
+    def test_patchers_are_reused_between_activations(self) -> None:
+        instance = ykcom("tests.packages_for_testing.p1", "os", "sys")
+
+        for key in ("first", "second", "third"):
+            with instance as mocked:
+                p1.mock_me(key)
+
+                assert mocked.mock_calls == [
+                    call.sys.stdout.write("Some text\n"),
+                    call.os.environ.__getitem__(key),
+                ]
+
+        assert len(instance._patchers) == len(instance._target)
@@ -0,0 +1,54 @@
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock, call
+
+import pytest
+
+from src.ykcom import ykcom
+from tests.packages_for_testing import p3
+
+
+def test_decorated_coroutine_function_pos() -> None:
+    @ykcom("tests.packages_for_testing.p3", "sys", "load")
+    async def test_inner(mocked: MagicMock) -> None:
+        mocked.load.return_value = "loaded"
+
+        assert await p3.mock_me_async("none") == "loaded"
+
+        assert isinstance(mocked.load, AsyncMock)
+        mocked.load.assert_awaited_once_with("none")
+        assert mocked.mock_calls == [call.sys.stdout.write("Some text\n"), call.load("none")]
+
+    asyncio.run(test_inner())  # type: ignore[call-arg]
+
+    assert p3.sys is sys
+
+
+def test_decorated_coroutine_method_named() -> None:
+    class TestInner:
+        @ykcom("tests.packages_for_testing.p3", "load", name="custom_name")
+        async def test_method(self, custom_name: MagicMock) -> None:
+            assert await p3.mock_me_async("none") == custom_name.load.return_value
+
+    asyncio.run(TestInner().test_method())  # type: ignore[call-arg]
+
+
+def test_async_context_manager() -> None:
+    async def inner() -> None:
+        async with ykcom("tests.packages_for_testing.p3", "load") as mocked:
+            await p3.mock_me_async("none")
+
+            mocked.load.assert_awaited_once_with("none")
+
+        assert await p3.load("none") == "NONE"
+
+    asyncio.run(inner())
+
+
+@pytest.mark.parametrize("engine", ["patch", "fast"])
+def test_async_children_can_be_disabled(engine: str) -> None:
+    with ykcom("tests.packages_for_testing.p3", "load", engine=engine, async_children=False) as mocked:  # type: ignore[arg-type]
+        assert not isinstance(mocked.load, AsyncMock)
+
+    with ykcom("tests.packages_for_testing.p3", "load", engine=engine) as mocked:  # type: ignore[arg-type]
+        assert isinstance(mocked.load, AsyncMock)
@@ -0,0 +1,142 @@
+import asyncio
+import gc
+import os
+import weakref
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from src.ykcom import ykcom
+from tests.packages_for_testing import p1, p3
+
+
+@pytest.mark.parametrize("engine", ["patch", "fast", "context"])
+def test_children_follow_the_spec(engine: str) -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", "sys", autospec=True, engine=engine) as mocked:  # type: ignore[arg-type]
+        p1.mock_me("none")
+
+        with pytest.raises(AttributeError):
+            p1.os.missing_function()  # type: ignore[attr-defined]
+        with pytest.raises(TypeError):
+            p1.os.makedirs()  # type: ignore[call-arg]
+
+        assert mocked.mock_calls == [
+            call.sys.stdout.write("Some text\n"),
+            call.os.environ.__getitem__("none"),
+        ]
+
+    assert p1.os is os
+
+
+def test_children_are_recycled_without_their_configuration() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", autospec=True) as mocked:
+        first = mocked.os
+        mocked.os.getcwd.return_value = "/configured"
+
+        assert p1.os.getcwd() == "/configured"
+
+    with ykcom("tests.packages_for_testing.p1", "os", autospec=True) as mocked:
+        assert mocked.os is first
+        assert mocked.os.mock_calls == []
+        assert isinstance(p1.os.getcwd(), MagicMock)
+
+
+def test_assigned_attributes_do_not_leak_into_the_next_run() -> None:
+    @ykcom("tests.packages_for_testing.p1", "os", autospec=True)
+    def test_a(mocked: MagicMock) -> None:
+        mocked.os.environ = {"none": "from test_a"}
+
+        assert p1.mock_me("none") == "from test_a"
+
+    @ykcom("tests.packages_for_testing.p1", "os", autospec=True)
+    def test_b(mocked: MagicMock) -> None:  # noqa: ARG001
+        assert isinstance(p1.mock_me("none"), MagicMock)
+
+    @ykcom("tests.packages_for_testing.p1", "os", autospec=True)
+    def test_c(mocked: MagicMock) -> None:
+        del mocked.os.getcwd
+
+    @ykcom("tests.packages_for_testing.p1", "os", autospec=True)
+    def test_d(mocked: MagicMock) -> None:
+        p1.os.getcwd()
+
+        assert mocked.mock_calls == [call.os.getcwd()]
+
+    for test in (test_a, test_b, test_c, test_d):
+        test()  # type: ignore[call-arg]
+
+
+def test_functions_are_recycled_without_their_configuration() -> None:
+    with ykcom("tests.packages_for_testing.p1", "mock_me", autospec=True) as mocked:
+        first = mocked.mock_me
+        mocked.mock_me.return_value = "configured"
+        mocked.mock_me.side_effect = None
+
+        assert p1.mock_me("KEY") == "configured"
+
+    with ykcom("tests.packages_for_testing.p1", "mock_me", autospec=True) as mocked:
+        assert mocked.mock_me is first
+        assert isinstance(p1.mock_me("KEY"), MagicMock)
+        mocked.mock_me.assert_called_once_with("KEY")
+
+        mocked.mock_me.extra = "assigned"
+
+    with ykcom("tests.packages_for_testing.p1", "mock_me", autospec=True) as mocked:
+        assert mocked.mock_me is not first
+        assert not hasattr(mocked.mock_me, "extra")
+
+
+def test_recycled_children_are_detached() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", autospec=True) as mocked:
+        child = mocked.os
+
+    assert child._mock_new_parent is None
+    assert child._mock_parent is None
+    assert "os" not in mocked._mock_children
+
+
+def test_pools_do_not_keep_the_originals(monkeypatch: pytest.MonkeyPatch) -> None:
+    class Client:
+        def fetch(self, key: str) -> str:
+            return key
+
+    client = Client()
+    monkeypatch.setattr(p3, "client", client, raising=False)
+    with ykcom("tests.packages_for_testing.p3", "client", autospec=True):
+        p3.client.fetch("KEY")  # type: ignore[attr-defined]
+
+    reference = weakref.ref(client)
+    monkeypatch.undo()
+    del client
+    gc.collect()
+
+    assert reference() is None
+
+
+def test_nested_instances_get_their_own_children() -> None:
+    with (
+        ykcom("tests.packages_for_testing.p1", "os", autospec=True) as outer,
+        ykcom("tests.packages_for_testing.p1", "os", autospec=True) as inner,
+    ):
+        p1.os.getcwd()
+
+        assert outer.os is not inner.os
+        assert inner.mock_calls == [call.os.getcwd()]
+        assert outer.mock_calls == []
+
+        with pytest.raises(TypeError):
+            p1.os.makedirs()  # type: ignore[call-arg]
+
+
+def test_coroutine_function() -> None:
+    @ykcom("tests.packages_for_testing.p3", "load", autospec=True)
+    async def test_inner(mocked: MagicMock) -> None:
+        mocked.load.return_value = "mocked"
+
+        assert await p3.mock_me_async("key") == "mocked"
+        mocked.load.assert_awaited_once_with("key")
+
+        with pytest.raises(TypeError):
+            await p3.load()  # type: ignore[call-arg]
+
+    asyncio.run(test_inner())  # type: ignore[call-arg]
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import _Call, call
+
+import pytest
+
+from src.ykcom import ykcom
+from src.ykcom.errors import UnsupportedContextTargetError
+from tests.packages_for_testing import p1, p4
+
+WORKERS = 16
+
+
+def test_original_is_visible_outside_the_context() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", engine="context") as mocked:
+        p1.mock_me("inside")
+
+        outside = threading.Thread(target=p1.mock_me, args=("PATH",))
+        outside.start()
+        outside.join()
+
+        assert mocked.mock_calls == [call.os.environ.__getitem__("inside")]
+
+    assert p1.os is os
+
+
+def test_nested_contexts_restore_the_outer_mock() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", engine="context") as outer:
+        with ykcom("tests.packages_for_testing.p1", "os", engine="context") as inner:
+            p1.mock_me("inner")
+
+            assert inner.mock_calls == [call.os.environ.__getitem__("inner")]
+
+        p1.mock_me("outer")
+
+        assert outer.mock_calls == [call.os.environ.__getitem__("outer")]
+
+    assert p1.os is os
+
+
+def test_concurrent_threads_do_not_share_mocks() -> None:
+    barrier = threading.Barrier(WORKERS)
+
+    def run(index: int) -> list[_Call]:
+        with ykcom("tests.packages_for_testing.p1", "os", engine="context") as mocked:
+            barrier.wait()
+            for _ in range(50):
+                p1.mock_me(f"key-{index}")
+            barrier.wait()
+
+            return list(mocked.mock_calls)
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        results = list(executor.map(run, range(WORKERS)))
+
+    for index, mock_calls in enumerate(results):
+        assert mock_calls == [call.os.environ.__getitem__(f"key-{index}")] * 50
+    assert p1.os is os
+
+
+def test_concurrent_tasks_do_not_share_mocks() -> None:
+    async def run(index: int, started: asyncio.Barrier) -> list[_Call]:
+        with ykcom("tests.packages_for_testing.p1", "os", engine="context") as mocked:
+            await started.wait()
+            for _ in range(10):
+                p1.mock_me(f"key-{index}")
+                await asyncio.sleep(0)
+
+            return list(mocked.mock_calls)
+
+    async def main() -> list[list[_Call]]:
+        started = asyncio.Barrier(WORKERS)
+        return await asyncio.gather(*(run(index, started) for index in range(WORKERS)))
+
+    results = asyncio.run(main())
+
+    for index, mock_calls in enumerate(results):
+        assert mock_calls == [call.os.environ.__getitem__(f"key-{index}")] * 10
+    assert p1.os is os
+
+
+def test_classes_are_rejected() -> None:
+    with (
+        pytest.raises(UnsupportedContextTargetError, match="'Client' is a class"),
+        ykcom("tests.packages_for_testing.p4", "os", "Client", engine="context"),
+    ):
+        ...
+
+    assert p4.os is os
+    assert isinstance(p4.Client(), p4.Client)
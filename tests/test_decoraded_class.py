@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from src.ykcom import ykcom
+from tests.packages_for_testing import p1
+
+
+@ykcom("tests.packages_for_testing.p1", "os", "sys")
+class TestDecoratedClassPositional:
+    def test_one(self, mocked: MagicMock) -> None:
+        p1.mock_me("none")
+
+        assert mocked.os.mock_calls == [call.environ.__getitem__("none")]
+        assert mocked.mock_calls == [
+            call.sys.stdout.write("Some text\n"),
+            call.os.environ.__getitem__("none"),
+        ]
+
+    def test_with_fixture(self, mocked: MagicMock, some_key: str) -> None:
+        p1.mock_me(some_key)
+
+        assert mocked.mock_calls == [
+            call.sys.stdout.write("Some text\n"),
+            call.os.environ.__getitem__(some_key),
+        ]
+
+    @pytest.mark.parametrize("param", [1, 2])
+    def test_parametrized(self, mocked: MagicMock, param: int) -> None:
+        key = f"none-{param}"
+
+        p1.mock_me(key)
+
+        assert mocked.os.mock_calls == [call.environ.__getitem__(key)]
+
+    def helper(self) -> str:
+        return "not a test"
+
+
+@ykcom("tests.packages_for_testing.p1", "os", name="custom_name")
+class TestDecoratedClassNamed:
+    def test_one(self, custom_name: MagicMock) -> None:
+        p1.mock_me("none")
+
+        assert custom_name.mock_calls == [call.os.environ.__getitem__("none")]
+
+    @ykcom("tests.packages_for_testing.p1", "sys", name="custom_name")
+    def test_merged_with_method_decorator(self, custom_name: MagicMock) -> None:
+        p1.mock_me("none")
+
+        assert custom_name.mock_calls == [
+            call.sys.stdout.write("Some text\n"),
+            call.os.environ.__getitem__("none"),
+        ]
+
+    @ykcom("tests.packages_for_testing.p1", "sys", name="other_name")
+    def test_with_method_decorator(self, custom_name: MagicMock, other_name: MagicMock) -> None:
+        p1.mock_me("none")
+
+        assert custom_name.mock_calls == [call.os.environ.__getitem__("none")]
+        assert other_name.mock_calls == [call.sys.stdout.write("Some text\n")]
+
+
+def test_methods_share_one_plan() -> None:
+    cls = TestDecoratedClassPositional
+
+    assert cls.helper(cls()) == "not a test"
+    assert cls.test_one._ykcom_plan.mock is cls.test_with_fixture._ykcom_plan.mock  # type: ignore[attr-defined]
+    assert cls.test_one._ykcom_plan.slot == 1  # type: ignore[attr-defined]
@@ -1,3 +1,4 @@
+import inspect
 from unittest.mock import MagicMock, call
 
 import pytest
@@ -208,3 +209,29 @@ def test_name_collision_on_different_packages_with_positional_instance_error() -
 # TODO
 # @ykcom("tests.packages_for_testing.p1", "os", "sys", name="custom_name")
 # @ykcom("tests.packages_for_testing.p2", {"target": "sys", "name": "sys2"}, name="custom_name")
+
+
+@ykcom("tests.packages_for_testing.p1", "os")
+@ykcom("tests.packages_for_testing.p1", "sys")
+def test_stacked_positional_with_fixture(mocked: MagicMock, some_key: str) -> None:
+    p1.mock_me(some_key)
+
+    assert mocked.os.mock_calls == [call.environ.__getitem__(some_key)]
+    assert mocked.mock_calls == [
+        call.sys.stdout.write("Some text\n"),
+        call.os.environ.__getitem__(some_key),
+    ]
+
+
+def test_invocation_plan_is_compiled_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    @ykcom("tests.packages_for_testing.p1", "os")
+    def test_inner(mocked: MagicMock) -> MagicMock:
+        return mocked
+
+    def fail(*_: object, **__: object) -> None:
+        raise AssertionError("signature must not be inspected per call")
+
+    monkeypatch.setattr(inspect, "signature", fail)
+
+    assert test_inner._ykcom_plan.slot == 0  # type: ignore[attr-defined]
+    assert test_inner() is test_inner()  # type: ignore[call-arg]
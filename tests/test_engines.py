@@ -0,0 +1,42 @@
+import os
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from src.ykcom import ykcom
+from src.ykcom.errors import UnknownEngineError
+from tests.packages_for_testing import p1
+
+
+class TestFastEngine:
+    def test_context_manager(self) -> None:
+        with ykcom("tests.packages_for_testing.p1", "os", "sys", engine="fast") as mocked:
+            p1.mock_me("none")
+
+            assert mocked.mock_calls == [
+                call.sys.stdout.write("Some text\n"),
+                call.os.environ.__getitem__("none"),
+            ]
+
+        assert p1.os is os
+
+    @ykcom("tests.packages_for_testing.p1", "os", name="custom_name", engine="fast")
+    def test_named_decorator(self, custom_name: MagicMock) -> None:
+        p1.mock_me("none")
+
+        assert custom_name.mock_calls == [call.os.environ.__getitem__("none")]
+
+
+@pytest.mark.parametrize("engine", ["patch", "fast", "context"])
+def test_failed_start_rolls_back_patched_targets(engine: str) -> None:
+    with pytest.raises(AttributeError), ykcom("tests.packages_for_testing.p1", "os", "missing", engine=engine):  # type: ignore[arg-type]
+        ...
+
+    assert p1.os is os
+
+
+def test_unknown_engine() -> None:
+    with pytest.raises(UnknownEngineError) as err, ykcom("tests.packages_for_testing.p1", "os", engine="slow"):  # type: ignore[arg-type]
+        ...
+
+    assert str(err.value) == "Unknown engine 'slow'"
@@ -0,0 +1,90 @@
+import json
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from src.ykcom import query, ykcom
+from src.ykcom.export import exporter_for
+from tests.packages_for_testing import p1
+
+
+def _records(path: Path) -> list[dict[str, object]]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.parametrize("record", ["full", "ring(1)", "counts"])
+def test_calls_are_streamed(tmp_path: Path, record: str) -> None:
+    path = tmp_path / "calls.jsonl"
+
+    with ykcom("tests.packages_for_testing.p1", "os", "sys", export=path, record=record) as mocked:
+        p1.mock_me("KEY")
+        mocked.os.path.join("a", b"b", key=[1, 2])
+
+        assert not path.exists()
+
+    records = _records(path)
+    assert [(r["path"], r["args"], r["kwargs"]) for r in records] == [
+        ("sys.stdout.write", ["'Some text\\n'"], {}),
+        ("os.environ.__getitem__", ["'KEY'"], {}),
+        ("os.path.join", ["'a'", "b'b'"], {"key": "[1, 2]"}),
+    ]
+    assert {r["test"] for r in records} == {f"tests/test_export.py::test_calls_are_streamed[{record}]"}
+    assert [r["time"] for r in records] == sorted(r["time"] for r in records)  # type: ignore[type-var]
+
+
+def test_batches_are_written_while_running(tmp_path: Path) -> None:
+    path = tmp_path / "calls.jsonl"
+    exporter_for(path).batch_size = 2
+
+    with ykcom("tests.packages_for_testing.p1", "os", export=path) as mocked:
+        for i in range(3):
+            mocked.os.getenv(i)
+
+        assert len(_records(path)) == 2  # noqa: PLR2004
+        assert query(mocked).count("os.getenv") == 3  # noqa: PLR2004
+
+    assert len(_records(path)) == 3  # noqa: PLR2004
+
+
+def test_calls_of_threads_are_not_lost(tmp_path: Path) -> None:
+    path = tmp_path / "calls.jsonl"
+    exporter_for(path).batch_size = 7
+    # Switch threads often, between the append and the flush of a batch
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+
+    def call_many(mocked: MagicMock, thread: int) -> None:
+        for i in range(500):
+            mocked.os.getenv(thread, i)
+
+    try:
+        with ykcom("tests.packages_for_testing.p1", "os", export=path) as mocked:
+            threads = [threading.Thread(target=call_many, args=(mocked, t)) for t in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert len(_records(path)) == 8 * 500
+
+
+def test_export_from_environment(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "calls.jsonl"
+    monkeypatch.setenv("YKCOM_EXPORT", str(path))
+
+    @ykcom("tests.packages_for_testing.p1", "os")
+    @ykcom("tests.packages_for_testing.p1", "sys")
+    def test_inner(mocked: MagicMock) -> None:
+        p1.mock_me("KEY")
+
+        assert mocked.mock_calls == [call.sys.stdout.write("Some text\n"), call.os.environ.__getitem__("KEY")]
+
+    test_inner()  # type: ignore[call-arg]
+    test_inner()  # type: ignore[call-arg]
+
+    assert [r["path"] for r in _records(path)] == ["sys.stdout.write", "os.environ.__getitem__"] * 2
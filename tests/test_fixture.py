@@ -0,0 +1,113 @@
+import os
+import textwrap
+
+import pytest
+
+from tests.packages_for_testing import p1, p2
+
+
+def test_calls_are_reset_between_the_tests(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        test_inner=textwrap.dedent(
+            """
+            from unittest.mock import MagicMock, call
+
+            from src.ykcom import ykcom
+            from tests.packages_for_testing import p1
+
+            mocked = ykcom.fixture("tests.packages_for_testing.p1", "os", "sys")
+
+            seen = []
+
+
+            def test_first(mocked):
+                mocked.os.environ.__getitem__.return_value = "value"
+
+                assert p1.mock_me("first") == "value"
+                assert mocked.mock_calls == [
+                    call.sys.stdout.write("Some text\\n"),
+                    call.os.environ.__getitem__("first"),
+                ]
+
+                seen.append(p1.os)
+
+
+            def test_second_is_reset(mocked):
+                assert mocked.mock_calls == []
+
+                result = p1.mock_me("second")
+
+                assert isinstance(result, MagicMock)
+                assert mocked.os.mock_calls == [call.environ.__getitem__("second")]
+
+                # The patches were kept between the tests
+                assert seen == [p1.os]
+            """,
+        ),
+    )
+
+    pytester.runpytest_inprocess().assert_outcomes(passed=2)
+
+    assert p1.os is os
+
+
+def test_patches_are_restored_at_the_end_of_the_scope(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        test_inner=textwrap.dedent(
+            """
+            import os
+
+            from src.ykcom import ykcom
+            from tests.packages_for_testing import p1, p2
+
+            mocked = ykcom.fixture("tests.packages_for_testing.p2", "os", scope="class")
+
+
+            class TestInner:
+                def test_one(self, mocked):
+                    assert p2.os is mocked.os
+
+                def test_two(self, mocked):
+                    assert p2.os is mocked.os
+
+
+            def test_after_class():
+                assert p2.os is os
+            """,
+        ),
+    )
+
+    pytester.runpytest_inprocess().assert_outcomes(passed=3)
+
+    assert p2.os is os
+
+
+@pytest.mark.parametrize("options", ["lazy=True", 'reset="fresh"'])
+def test_children_stay_patched_between_the_tests(pytester: pytest.Pytester, options: str) -> None:
+    pytester.makepyfile(
+        test_inner=textwrap.dedent(
+            f"""
+            from src.ykcom import ykcom
+            from tests.packages_for_testing import p1
+
+            mocked = ykcom.fixture("tests.packages_for_testing.p1", "os", "sys", {options})
+
+
+            def test_one(mocked):
+                mocked.os.environ.__getitem__.return_value = "a"
+
+                assert p1.mock_me("a") == "a"
+
+
+            def test_two(mocked):
+                mocked.os.environ.__getitem__.return_value = "v"
+
+                assert p1.mock_me("b") == "v"
+                assert mocked.os.environ.__getitem__.call_count == 1
+            """,
+        ),
+    )
+
+    pytester.runpytest_inprocess().assert_outcomes(passed=2)
+
+    assert p1.os is os
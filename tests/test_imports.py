@@ -0,0 +1,105 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+OPTIONAL = [
+    "src.ykcom.autospec",
+    "src.ykcom.context",
+    "src.ykcom.export",
+    "src.ykcom.instrumentation",
+    "src.ykcom.plans",
+    "src.ykcom.pytest_plugin",
+    "src.ykcom.scoped",
+    "src.ykcom.snapshot",
+    "src.ykcom.spy",
+]
+
+
+def _imported_after(code: str) -> set[str]:
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", f"{code}\nimport sys\nprint('\\n'.join(sys.modules))"],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        text=True,
+    )
+
+    return set(process.stdout.split())
+
+
+def test_optional_subsystems_are_not_imported() -> None:
+    imported = _imported_after("import src.ykcom")
+
+    assert imported.isdisjoint(OPTIONAL)
+    assert imported.isdisjoint(["inspect", "pytest", "src.ykcom.ykcom", "unittest.mock"])
+
+
+def test_public_names_are_imported_on_first_use() -> None:
+    imported = _imported_after("from src.ykcom import MockData, query, ykcom\nimport src.ykcom.recording")
+
+    assert "unittest.mock" in imported
+    assert imported.isdisjoint(OPTIONAL)
+
+
+def test_submodules_do_not_shadow_the_public_names() -> None:
+    code = """
+from src.ykcom import ykcom
+import src.ykcom.query
+import src.ykcom.ykcom
+from src.ykcom import query
+assert callable(query) and isinstance(ykcom, type) and src.ykcom.ykcom is ykcom, (query, ykcom)
+"""
+
+    _imported_after(code)
+
+
+def test_public_names_can_be_patched() -> None:
+    code = """
+from unittest import mock
+import src.ykcom
+with mock.patch("src.ykcom.query", "replaced"), mock.patch("src.ykcom.ykcom", "replaced"):
+    from src.ykcom import query, ykcom
+    assert query == ykcom == "replaced", (query, ykcom)
+assert callable(src.ykcom.query) and isinstance(src.ykcom.ykcom, type)
+"""
+
+    _imported_after(code)
+
+
+@pytest.mark.parametrize(
+    ("options", "imported"),
+    [
+        ([], set()),
+        (["--ykcom-timings"], {"src.ykcom.instrumentation"}),
+    ],
+)
+def test_plugin_imports_the_subsystems_of_its_options(options: list[str], imported: set[str]) -> None:
+    code = f"""
+import pytest
+pytest.main(["-p", "src.ykcom.pytest_plugin", "-p", "no:cacheprovider", "--collect-only", *{options}, {__file__!r}])
+"""
+
+    modules = {"src.ykcom.instrumentation", "src.ykcom.snapshot", "src.ykcom.ykcom"}
+    assert modules & _imported_after(code) == imported
+
+
+@pytest.mark.parametrize(
+    ("options", "module"),
+    [
+        ("spy=True", "src.ykcom.spy"),
+        ("autospec=True", "src.ykcom.autospec"),
+        ('engine="context"', "src.ykcom.context"),
+    ],
+)
+def test_optional_subsystems_are_imported_on_first_use(options: str, module: str) -> None:
+    code = f"""
+from src.ykcom import ykcom
+with ykcom("tests.packages_for_testing.p1", "os", {options}):
+    pass
+"""
+
+    assert module in _imported_after(code)
@@ -0,0 +1,106 @@
+import json
+import sys
+import textwrap
+from collections.abc import Iterator
+
+import pytest
+
+from src.ykcom import instrumentation, ykcom
+from src.ykcom.recording import ArgSummary
+from tests.packages_for_testing import p1
+
+
+@pytest.fixture
+def recorder() -> Iterator[instrumentation.Recorder]:
+    recorder = instrumentation.enable()
+    recorder.current_test = "some_test"
+    yield recorder
+    instrumentation.disable()
+
+
+def test_timings_per_target(recorder: instrumentation.Recorder) -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", "sys") as mocked:
+        p1.mock_me("none")
+        mocked.os.path.join.return_value = "path"
+
+    os_timings = recorder.timings["some_test", "tests.packages_for_testing.p1.os"]
+    sys_timings = recorder.timings["some_test", "tests.packages_for_testing.p1.sys"]
+    assert os_timings.resolve > 0
+    assert os_timings.start > 0
+    assert os_timings.stop > 0
+    assert os_timings.reset > 0
+    # os, environ, environ.__getitem__ and its return value, path and path.join (its return value is not a mock)
+    assert os_timings.nodes == 6  # noqa: PLR2004
+    # sys, stdout, stdout.write and its return value
+    assert sys_timings.nodes == 4  # noqa: PLR2004
+    assert recorder.by_test()["some_test"].nodes == os_timings.nodes + sys_timings.nodes
+
+
+@pytest.mark.parametrize(
+    ("retain", "expected"),
+    [
+        ("full", sys.getsizeof(b"x" * 5000)),
+        # Too large to be kept without a weak reference
+        ("weak", sys.getsizeof(ArgSummary(b"x" * 5000).repr)),
+        ("repr(20)", sys.getsizeof(ArgSummary(b"x" * 5000, 20).repr)),
+    ],
+)
+def test_retained_bytes(recorder: instrumentation.Recorder, retain: str, expected: int) -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", "sys", retain=retain):
+        p1.mock_me(b"x" * 5000)  # type: ignore[arg-type]
+
+    assert recorder.timings["some_test", "tests.packages_for_testing.p1.os"].retained == expected
+    assert recorder.by_test()["some_test"].retained > expected
+
+
+def test_nothing_is_recorded_when_disabled() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os"):
+        p1.mock_me("none")
+
+    assert instrumentation.recorder is None
+
+
+def test_plugin_report(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        test_inner=textwrap.dedent(
+            """
+            from src.ykcom import ykcom
+            from tests.packages_for_testing import p2
+
+
+            @ykcom("tests.packages_for_testing.p2", "os", "sys")
+            def test_patched(mocked):
+                p2.mockery("key")
+
+
+            def test_not_patched():
+                pass
+            """,
+        ),
+    )
+
+    result = pytester.runpytest_inprocess(
+        "-p",
+        "src.ykcom.pytest_plugin",
+        "--ykcom-timings",
+        "--ykcom-timings-json=timings.json",
+    )
+
+    result.assert_outcomes(passed=2)
+    # The targets are sorted by their timings, their order is not stable
+    result.stdout.fnmatch_lines(
+        [
+            "*ykcom timings*",
+            "Most expensive targets (top 10):",
+            "*tests.packages_for_testing.p2.*",
+            "*tests.packages_for_testing.p2.*",
+            "Most expensive tests (top 10):",
+            "*test_inner.py::test_patched",
+        ],
+    )
+    assert "tests.packages_for_testing.p2.os" in result.stdout.str()
+    assert "tests.packages_for_testing.p2.sys" in result.stdout.str()
+    report = json.loads((pytester.path / "timings.json").read_text())
+    assert set(report["targets"]) == {"tests.packages_for_testing.p2.os", "tests.packages_for_testing.p2.sys"}
+    assert set(report["tests"]) == {"test_inner.py::test_patched"}
+    assert instrumentation.recorder is None
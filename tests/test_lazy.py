@@ -0,0 +1,38 @@
+import sys
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from src.ykcom import ykcom
+from tests.packages_for_testing import p1, p2
+
+
+@pytest.mark.parametrize("engine", ["patch", "fast"])
+def test_only_used_targets_are_created(engine: str) -> None:
+    with ykcom("tests.packages_for_testing.p2", "os", "sys", lazy=True, engine=engine) as mocked:  # type: ignore[arg-type]
+        p2.mockery()
+
+        assert "os" not in mocked._mock_children
+        assert p2.sys is mocked.sys
+        assert mocked.mock_calls == [
+            call.sys.stdout.write("Something else\n"),
+            call.sys.stdout.flush(),
+        ]
+
+    assert p2.sys is sys
+
+
+@ykcom("tests.packages_for_testing.p1", "os", "sys", lazy=True)
+@pytest.mark.parametrize("param", [1, 2])
+def test_lazy_decorator_parametrized(mocked: MagicMock, param: int) -> None:
+    key = f"none-{param}"
+
+    # Configured in the first run only, the second run gets a fresh child
+    assert isinstance(mocked.os.environ.__getitem__.return_value, MagicMock)
+    mocked.os.environ.__getitem__.return_value = "configured"
+
+    assert p1.mock_me(key) == "configured"
+    assert mocked.mock_calls == [
+        call.sys.stdout.write("Some text\n"),
+        call.os.environ.__getitem__(key),
+    ]
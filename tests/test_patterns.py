@@ -0,0 +1,56 @@
+import importlib
+import json
+import os
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from src.ykcom import ykcom
+from src.ykcom.errors import PatternNotMatchedError
+from src.ykcom.index import module_index
+from tests.packages_for_testing import p4
+
+
+@ykcom("tests.packages_for_testing.p4", "client_*")
+def test_pattern(mocked: MagicMock) -> None:
+    mocked.client_a.fetch.return_value = "a"
+    mocked.client_b.fetch.return_value = "b"
+
+    assert p4.fetch_all("KEY") == json.dumps(["a", "b", os.environ.get("KEY")])
+    assert mocked.mock_calls == [call.client_a.fetch("KEY"), call.client_b.fetch("KEY")]
+    assert isinstance(p4.other, p4.Client)
+
+
+def test_all_imported_modules() -> None:
+    with ykcom("tests.packages_for_testing.p4", ykcom.ALL_IMPORTED_MODULES) as mocked:
+        p4.fetch_all("KEY")
+
+        assert p4.json is mocked.json
+        assert p4.os is mocked.os
+        assert isinstance(p4.client_a, p4.Client)
+
+    assert p4.json is json
+    assert p4.os is os
+
+
+def test_full_path_pattern() -> None:
+    with ykcom("unused", "tests.packages_for_testing.p4.client_[ab]") as mocked:
+        assert p4.client_a is mocked.client_a
+        assert p4.client_b is mocked.client_b
+
+
+def test_pattern_without_match() -> None:
+    with pytest.raises(PatternNotMatchedError) as err:
+        ykcom("tests.packages_for_testing.p4", "server_*")
+
+    assert str(err.value) == "'server_*' does not match any attribute of 'tests.packages_for_testing.p4'"
+
+
+def test_index_is_rebuilt_on_reload() -> None:
+    index = module_index("tests.packages_for_testing.p4")
+
+    assert module_index("tests.packages_for_testing.p4") is index
+
+    importlib.reload(p4)
+
+    assert module_index("tests.packages_for_testing.p4") is not index
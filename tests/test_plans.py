@@ -0,0 +1,86 @@
+import errno
+import marshal
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.ykcom import ykcom
+from src.ykcom.index import CACHED_MODULE_SIZE
+from src.ykcom.plans import ModulePlan
+
+P4 = "tests.packages_for_testing.p4"
+
+
+@pytest.fixture
+def cache_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("YKCOM_PLAN_CACHE", str(tmp_path / "plans"))
+    return tmp_path / "plans"
+
+
+@pytest.fixture
+def large_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    module = tmp_path / "plans_large.py"
+    module.write_text("\n".join(f"def dep_{i}(): ..." for i in range(CACHED_MODULE_SIZE)))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "plans_large", raising=False)
+
+    return module
+
+
+def test_plans_are_picklable() -> None:
+    plan = ModulePlan(module=P4, source=("p4.py", 1, 2), matches={"client_*": ("client_a", "client_b")})
+
+    loaded = pickle.loads(pickle.dumps(plan))  # noqa: S301
+
+    assert (loaded.module, loaded.source, loaded.matches) == (plan.module, plan.source, plan.matches)
+
+
+@pytest.mark.usefixtures("large_module")
+def test_matches_are_stored_and_loaded(cache_directory: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert ykcom("plans_large", "dep_1?")._names == [f"dep_{i}" for i in range(10, 20)]
+    assert [p.name for p in cache_directory.iterdir()] == ["plans_large.plan"]
+
+    # Loaded from the cache by a new process, the patterns are not matched again
+    monkeypatch.setattr(sys.modules["src.ykcom.plans"], "_caches", {})
+    monkeypatch.setattr(sys.modules["src.ykcom.plans"], "module_index", None)
+    instance = ykcom("plans_large", "dep_1?")
+
+    assert instance._target == [f"plans_large.dep_{i}" for i in range(10, 20)]
+    with instance as mocked:
+        assert sys.modules["plans_large"].dep_10 is mocked.dep_10
+
+
+def test_plans_depend_on_the_source(large_module: Path, cache_directory: Path) -> None:
+    ykcom("plans_large", "dep_1?")
+
+    large_module.write_text(large_module.read_text() + "\ndef dep_1a(): ...\n")
+    del sys.modules["plans_large"]
+
+    assert ykcom("plans_large", "dep_1?")._names[-1] == "dep_1a"
+    assert [p.name for p in cache_directory.iterdir()] == ["plans_large.plan"]
+
+
+def test_small_modules_are_not_cached(cache_directory: Path) -> None:
+    assert ykcom(P4, "client_*")._names == ["client_a", "client_b"]
+
+    assert not cache_directory.exists()
+
+
+@pytest.mark.usefixtures("large_module")
+def test_a_path_to_a_file_is_not_a_cache(cache_directory: Path) -> None:
+    cache_directory.write_text("")
+
+    assert len(ykcom("plans_large", "dep_1?")._names) == 10  # noqa: PLR2004
+
+
+@pytest.mark.usefixtures("large_module")
+def test_failed_writes_are_ignored(cache_directory: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def dump(*_: object) -> None:
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(marshal, "dump", dump)
+
+    assert len(ykcom("plans_large", "dep_1?")._names) == 10  # noqa: PLR2004
+    assert list(cache_directory.iterdir()) == []
@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock, call
+
+from src.ykcom import query, ykcom
+from tests.packages_for_testing import p1, p2
+
+
+@ykcom("tests.packages_for_testing.p1", "os", "sys")
+def test_query_by_path(mocked: MagicMock) -> None:
+    for key in ("first", "second", "third"):
+        p1.mock_me(key)
+
+    calls = query(mocked)
+
+    assert calls.count("os.environ.__getitem__") == 3  # noqa: PLR2004
+    assert calls.count("os.getenv") == 0
+    assert calls.calls_to("os.environ.__getitem__") == [
+        call.os.environ.__getitem__("first"),
+        call.os.environ.__getitem__("second"),
+        call.os.environ.__getitem__("third"),
+    ]
+    assert calls.first("sys.stdout.write") == call.sys.stdout.write("Some text\n")
+    assert calls.last("os.environ.__getitem__") == call.os.environ.__getitem__("third")
+    assert calls.last("os.getenv") is None
+
+
+@ykcom("tests.packages_for_testing.p1", "os", "sys")
+def test_contains_in_order(mocked: MagicMock) -> None:
+    for key in ("first", "second", "third"):
+        p1.mock_me(key)
+
+    calls = query(mocked)
+
+    assert calls.contains_in_order(
+        call.os.environ.__getitem__("first"),
+        call.sys.stdout.write("Some text\n"),
+        call.os.environ.__getitem__("third"),
+    )
+    assert not calls.contains_in_order(
+        call.os.environ.__getitem__("third"),
+        call.os.environ.__getitem__("first"),
+    )
+    assert calls.contains_in_order()
+
+
+def test_index_is_rebuilt_after_reset() -> None:
+    instance = ykcom("tests.packages_for_testing.p2", "sys")
+    for _ in range(2):
+        with instance as mocked:
+            p2.mockery()
+
+            assert query(mocked).count("sys.stdout.flush") == 1
+
+
+@ykcom("tests.packages_for_testing.p1", "os")
+def test_index_follows_the_changes_of_the_calls(mocked: MagicMock) -> None:
+    for key in ["a", "b", "c"]:
+        mocked.os.getenv(key)
+    calls = query(mocked)
+
+    del mocked.mock_calls[0]
+    assert calls.first("os.getenv") == call.os.getenv("b")
+
+    mocked.mock_calls.extend([call.os.remove("d"), call.os.getenv("e")])
+    assert calls.last("os.getenv") == call.os.getenv("e")
+    assert calls.count("os.remove") == 1
+
+    mocked.mock_calls.insert(0, call.os.remove("f"))
+    assert calls.calls_to("os.remove") == [call.os.remove("f"), call.os.remove("d")]
+
+    mocked.mock_calls.clear()
+    assert calls.count("os.getenv") == 0
+    assert mocked.mock_calls.positions == {}
+
+
+@ykcom("tests.packages_for_testing.p1", "os", "sys", record="counts")
+def test_count_in_counts_mode(mocked: MagicMock) -> None:
+    p1.mock_me("none")
+
+    assert query(mocked).count("sys.stdout.write") == 1
+    assert query(mocked.sys).count("stdout.write") == 1
+
+
+def test_query_on_child_mock() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os") as mocked:
+        p1.mock_me("none")
+
+        assert query(mocked.os).calls_to("environ.__getitem__") == [call.environ.__getitem__("none")]
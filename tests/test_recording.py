@@ -0,0 +1,197 @@
+import asyncio
+import gc
+import weakref
+from dataclasses import dataclass, field
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from src.ykcom import ykcom
+from src.ykcom.errors import UnknownRecordModeError, UnknownRetainPolicyError
+from src.ykcom.recording import RingCallList
+from tests.packages_for_testing import p1, p3
+
+
+class Payload(list[int]):
+    def __repr__(self) -> str:
+        return f"Payload({len(self)})"
+
+
+def test_ring_keeps_the_last_calls() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", record="ring(2)") as mocked:
+        for key in ("first", "second", "third"):
+            p1.mock_me(key)
+
+        assert mocked.mock_calls == [
+            call.os.environ.__getitem__("second"),
+            call.os.environ.__getitem__("third"),
+        ]
+        assert mocked.os.environ.__getitem__.call_args_list == [call("second"), call("third")]
+        assert mocked.os.environ.__getitem__.call_count == 3  # noqa: PLR2004
+
+
+def test_ring_drops_the_calls_in_batches() -> None:
+    calls = RingCallList(2)
+    for index in range(1000):
+        calls.append(call.first(index) if index == 0 else call.other(index))
+
+    assert list.__len__(calls) < 1000  # noqa: PLR2004
+    assert calls == [call.other(998), call.other(999)]
+    assert calls[0] == call.other(998)
+    assert call.other(999) in calls
+    assert calls.paths == {"first", "other"}
+
+
+@ykcom("tests.packages_for_testing.p1", "os", "sys", record="counts")
+def test_counts_only(mocked: MagicMock) -> None:
+    for key in ("first", "second", "third"):
+        p1.mock_me(key)
+
+    assert mocked.mock_calls == []
+    assert mocked.mock_calls.counts == {"sys.stdout.write": 3, "os.environ.__getitem__": 3}
+    assert mocked.os.mock_calls.counts == {"environ.__getitem__": 3}
+    mocked.os.environ.__getitem__.assert_called_with("third")
+
+
+def test_summary_does_not_keep_the_arguments() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", record="summary") as mocked:
+        payload = Payload(range(1_000_000))
+        ref = weakref.ref(payload)
+
+        p1.mock_me(payload)  # type: ignore[arg-type]
+        p1.mock_me("none")
+
+        del payload
+        gc.collect()
+
+        assert ref() is None
+        assert mocked.mock_calls == [
+            call.os.environ.__getitem__(Payload(range(1_000_000))),
+            call.os.environ.__getitem__("none"),
+        ]
+        assert repr(mocked.os.environ.__getitem__.call_args_list[0]) == "call(Payload(1000000))"
+
+
+@pytest.mark.parametrize("key", ["first", "second"])
+@ykcom("tests.packages_for_testing.p1", "os", record="ring(1)", reset="touched")
+def test_bounded_modes_with_touched_reset(mocked: MagicMock, key: str) -> None:
+    p1.mock_me("other")
+    p1.mock_me(key)
+
+    assert mocked.mock_calls == [call.os.environ.__getitem__(key)]
+    assert mocked.os.environ.__getitem__.call_count == 2  # noqa: PLR2004
+
+
+def test_unknown_record_mode() -> None:
+    with pytest.raises(UnknownRecordModeError) as err:
+        ykcom("tests.packages_for_testing.p1", "os", record="ring")
+
+    assert str(err.value) == "Unknown record mode 'ring'"
+
+
+@dataclass
+class Blob:
+    size: int
+    data: bytearray = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.data = bytearray(self.size)
+
+
+def test_weak_retention_does_not_keep_the_arguments_alive() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", retain="weak") as mocked:
+        blob = Blob(1_000_000)
+        ref = weakref.ref(blob)
+
+        p1.mock_me(blob)  # type: ignore[arg-type]
+        p1.mock_me("none")
+
+        assert mocked.mock_calls == [call.os.environ.__getitem__(blob), call.os.environ.__getitem__("none")]
+
+        del blob
+        gc.collect()
+
+        assert ref() is None
+        assert repr(mocked.os.environ.__getitem__.call_args_list[0]) == "call(<collected Blob>)"
+
+
+def test_weak_retention_summarizes_large_values_without_weak_references() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", retain="weak") as mocked:
+        p1.mock_me("small")
+        p1.mock_me(b"x" * 10_000)  # type: ignore[arg-type]
+
+        small, large = (c.args[0] for c in mocked.os.environ.__getitem__.call_args_list)
+        assert small == "small"
+        assert type(small) is str
+        assert large == b"x" * 10_000
+        assert large != b"y" * 10_000
+
+
+class Array:
+    """Compares element-wise like the arrays, the result of the comparisons has no truth value."""
+
+    def __eq__(self, other: object) -> "Array":  # type: ignore[override]
+        return self
+
+    def __bool__(self) -> bool:
+        raise ValueError("The truth value of an array is ambiguous")
+
+    __hash__ = object.__hash__
+
+
+def test_weak_retention_compares_array_likes_by_identity() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", retain="weak") as mocked:
+        array = Array()
+        p1.mock_me(array)  # type: ignore[arg-type]
+
+        recorded = mocked.os.environ.__getitem__.call_args.args[0]
+        assert recorded == array
+
+
+def test_weak_retention_of_the_awaits() -> None:
+    async def inner() -> weakref.ref[Blob]:
+        with ykcom("tests.packages_for_testing.p3", "load", retain="weak") as mocked:
+            blob = Blob(1_000_000)
+            await p3.load(blob)  # type: ignore[arg-type]
+
+            mocked.load.assert_awaited_once_with(blob)
+            mocked.load.assert_has_awaits([call(blob)])
+
+            ref = weakref.ref(blob)
+            del blob
+            gc.collect()
+
+            assert repr(mocked.load.await_args) == "call(<collected Blob>)"
+            assert repr(mocked.load.await_args_list) == "[call(<collected Blob>)]"
+            return ref
+
+    assert asyncio.run(inner())() is None
+
+
+def test_repr_retention() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", retain="repr(10)") as mocked:
+        buffer = bytearray(b"some long content")
+        p1.mock_me(buffer)  # type: ignore[arg-type]
+
+        recorded = mocked.os.environ.__getitem__.call_args.args[0]
+        assert len(repr(recorded)) <= 10  # noqa: PLR2004
+        # Unhashable buffers are compared by the fingerprint of their content
+        assert recorded == bytearray(b"some long content")
+        assert recorded != bytearray(b"some long contenT")
+
+
+@pytest.mark.parametrize("index", [0, 1])
+@ykcom("tests.packages_for_testing.p1", "os", retain="weak")
+def test_weak_retention_across_parametrized_runs(mocked: MagicMock, index: int) -> None:
+    p1.mock_me(Blob(index))  # type: ignore[arg-type]
+
+    # The argument is not referenced by anything else
+    gc.collect()
+    assert repr(mocked.mock_calls) == "[call.os.environ.__getitem__(<collected Blob>)]"
+
+
+def test_unknown_retain_policy() -> None:
+    with pytest.raises(UnknownRetainPolicyError) as err:
+        ykcom("tests.packages_for_testing.p1", "os", retain="repr")
+
+    assert str(err.value) == "Unknown retain policy 'repr'"
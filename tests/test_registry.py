@@ -0,0 +1,101 @@
+import os
+import threading
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from src.ykcom import ykcom
+from src.ykcom.registry import active_patches
+from tests.packages_for_testing import p1
+
+
+@ykcom("tests.packages_for_testing.p1", "os", "sys")
+@ykcom("tests.packages_for_testing.p1", "os")
+def test_stacked_decorators_share_the_patch(mocked: MagicMock) -> None:
+    assert active_patches() == 2  # noqa: PLR2004
+    assert p1.os is mocked.os
+
+    p1.mock_me("KEY")
+
+    assert mocked.mock_calls == [call.sys.stdout.write("Some text\n"), call.os.environ.__getitem__("KEY")]
+
+
+def test_nested_instances_are_layered() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os") as outer:
+        with ykcom("tests.packages_for_testing.p1", "os") as inner:
+            assert active_patches() == 1
+            assert p1.os is inner.os
+
+        assert p1.os is outer.os
+
+    assert p1.os is os
+    assert active_patches() == 0
+
+
+def test_reentered_instance_is_restored() -> None:
+    instance = ykcom("tests.packages_for_testing.p1", "os")
+
+    with instance as outer:
+        with instance as inner:
+            assert inner is outer
+            assert p1.os is outer.os
+
+        assert p1.os is outer.os
+
+    assert p1.os is os
+    assert active_patches() == 0
+
+
+def test_out_of_order_stop() -> None:
+    first = ykcom("tests.packages_for_testing.p1", "os")
+    second = ykcom("tests.packages_for_testing.p1", "os")
+
+    first_mock = first.__enter__()
+    second_mock = second.__enter__()
+    first.__exit__(None, None, None)
+
+    assert p1.os is second_mock.os
+
+    second.__exit__(None, None, None)
+
+    assert p1.os is os
+    assert isinstance(first_mock, MagicMock)
+
+
+@pytest.mark.parametrize("engine", ["patch", "fast"])
+def test_failed_start_keeps_the_outer_patches(engine: str) -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", engine=engine) as outer:  # type: ignore[arg-type]
+        with (
+            pytest.raises(AttributeError),
+            ykcom("tests.packages_for_testing.p1", "sys", "os", "missing", engine=engine),  # type: ignore[arg-type]
+        ):
+            ...
+
+        assert p1.os is outer.os
+        assert active_patches() == 1
+
+    assert p1.os is os
+    assert active_patches() == 0
+
+
+def test_exception_in_nested_block() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os") as outer:
+        with pytest.raises(KeyError), ykcom("tests.packages_for_testing.p1", "os"):
+            raise KeyError
+
+        assert p1.os is outer.os
+
+    assert p1.os is os
+
+
+def test_registry_is_per_thread() -> None:
+    seen: list[int] = []
+
+    with ykcom("tests.packages_for_testing.p1", "os"):
+        thread = threading.Thread(target=lambda: seen.append(active_patches()))
+        thread.start()
+        thread.join()
+
+        assert active_patches() == 1
+
+    assert seen == [0]
@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from src.ykcom import ykcom
+from src.ykcom.reset import reset_touched
+from tests.packages_for_testing import p1
+
+_children: dict[str, list[MagicMock]] = {"touched": [], "fresh": []}
+
+
+def test_reset_touched_only_visits_mocks_with_calls() -> None:
+    root = MagicMock()
+    root.a.b.c(1)
+    root.x.y().z(2)
+    root.untouched.attribute.return_value = 3
+
+    touched = [root, root.a, root.a.b, root.a.b.c, root.x, root.x.y, root.x.y.return_value, root.x.y.return_value.z]
+
+    assert reset_touched(root) == len(touched)
+
+    assert root.mock_calls == []
+    assert root.a.b.c.call_count == 0
+    assert root.x.y.return_value.z.mock_calls == []
+    assert root.untouched.attribute.return_value == 3  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("strategy", ["touched", "fresh"])
+@pytest.mark.parametrize("key", ["first", "second"])
+def test_strategies_reset_between_runs(strategy: str, key: str) -> None:
+    @ykcom("tests.packages_for_testing.p1", "os", "sys", reset=strategy)  # type: ignore[arg-type]
+    def test_inner(mocked: MagicMock) -> None:
+        p1.mock_me(key)
+
+        assert mocked.mock_calls == [
+            call.sys.stdout.write("Some text\n"),
+            call.os.environ.__getitem__(key),
+        ]
+        assert mocked.os.environ.__getitem__.call_count == 1
+
+        _children[strategy].append(mocked.os)
+
+    test_inner()  # type: ignore[call-arg]
+    test_inner()  # type: ignore[call-arg]
+
+    first, second = _children[strategy][-2:]
+    if strategy == "touched":
+        assert first is second
+    else:
+        assert first is not second
@@ -0,0 +1,92 @@
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from src.ykcom import snapshot, ykcom
+from tests.packages_for_testing import p1
+
+SNAPSHOT = Path("tests", "__snapshots__", "test_snapshot")
+
+
+@pytest.fixture(autouse=True)
+def snapshot_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # Outside of the plugin the node ids are relative to the current directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_update_and_match(snapshot_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", "sys") as mocked:
+        p1.mock_me("KEY")
+        mocked.os.path.join(mocked.sys, "file")
+
+        monkeypatch.setenv(snapshot.UPDATE_VARIABLE, "1")
+        mocked.assert_matches_snapshot()
+        monkeypatch.delenv(snapshot.UPDATE_VARIABLE)
+
+        mocked.assert_matches_snapshot()
+
+    assert (snapshot_root / SNAPSHOT / "test_update_and_match.calls").read_text().splitlines()[1:] == [
+        "call.sys.stdout.write('Some text\\n')",
+        "call.os.environ.__getitem__('KEY')",
+        "call.os.path.join(<MagicMock name='mock.sys' id='<id>'>, 'file')",
+    ]
+
+
+def test_mismatch_is_diffed(monkeypatch: pytest.MonkeyPatch) -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", "sys") as mocked:
+        p1.mock_me("KEY")
+        with monkeypatch.context() as update:
+            update.setenv(snapshot.UPDATE_VARIABLE, "1")
+            mocked.assert_matches_snapshot("first")
+
+        mocked.reset_mock()
+        p1.mock_me("OTHER")
+
+        with pytest.raises(AssertionError) as err:
+            mocked.assert_matches_snapshot("first")
+
+    assert str(err.value).splitlines()[-3:] == [
+        " call.sys.stdout.write('Some text\\n')",
+        "-call.os.environ.__getitem__('KEY')",
+        "+call.os.environ.__getitem__('OTHER')",
+    ]
+
+
+@pytest.mark.parametrize("param", ["a/b"])
+def test_missing_snapshot(snapshot_root: Path, param: str) -> None:
+    with ykcom("tests.packages_for_testing.p1", "os") as mocked:
+        mocked.os.getenv(param)
+
+        with pytest.raises(AssertionError) as err:
+            mocked.assert_matches_snapshot()
+
+    path = snapshot_root / SNAPSHOT / "test_missing_snapshot[a_b].calls"
+    assert str(err.value) == f"Snapshot {path} does not exist, set YKCOM_UPDATE_SNAPSHOTS=1 to create it"
+    assert not path.exists()
+
+
+def test_plugin_update_option(pytester: pytest.Pytester) -> None:
+    # The inner runs patch p1, imported by this module: they patch and call the same module
+    pytester.makepyfile(
+        test_inner=textwrap.dedent(
+            """
+            from src.ykcom import ykcom
+            from tests.packages_for_testing import p1
+
+
+            @ykcom("tests.packages_for_testing.p1", "os", "sys")
+            def test_calls(mocked):
+                p1.mock_me("KEY")
+
+                mocked.assert_matches_snapshot()
+            """,
+        ),
+    )
+
+    pytester.runpytest_inprocess("-p", "src.ykcom.pytest_plugin").assert_outcomes(failed=1)
+    pytester.runpytest_inprocess("-p", "src.ykcom.pytest_plugin", "--ykcom-update-snapshots").assert_outcomes(passed=1)
+    pytester.runpytest_inprocess("-p", "src.ykcom.pytest_plugin").assert_outcomes(passed=1)
+
+    assert (pytester.path / "__snapshots__" / "test_inner" / "test_calls.calls").exists()
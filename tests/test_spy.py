@@ -0,0 +1,82 @@
+import json
+import os
+import sys
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from src.ykcom import query, ykcom
+from tests.packages_for_testing import p1, p4
+
+
+@pytest.mark.parametrize("engine", ["patch", "fast", "context"])
+def test_calls_are_recorded_and_executed(engine: str) -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", "sys", spy=True, engine=engine) as mocked:  # type: ignore[arg-type]
+        assert p1.mock_me("PATH") == os.environ["PATH"]
+
+        assert mocked.mock_calls == [
+            call.sys.stdout.write("Some text\n"),
+            call.os.environ.__getitem__("PATH"),
+        ]
+        assert query(mocked).count("os.environ.__getitem__") == 1
+
+    assert p1.os is os
+    assert p1.sys is sys
+
+
+@ykcom("tests.packages_for_testing.p4", "client_a", "json", spy=True)
+def test_plain_data_is_not_spied(mocked: MagicMock) -> None:
+    values = ["KEY", "KEY", os.environ.get("KEY")]
+
+    assert p4.fetch_all("KEY") == json.dumps(values)
+
+    assert p4.json.__name__ == "json"
+    assert mocked.client_a is p4.client_a
+    assert mocked.mock_calls == [call.client_a.fetch("KEY"), call.json.dumps(values)]
+
+
+def test_exceptions_are_raised_after_recording() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", spy=True) as mocked:
+        with pytest.raises(KeyError):
+            p1.mock_me("MISSING_KEY_FOR_YKCOM_TESTS")
+
+        assert mocked.mock_calls == [call.os.environ.__getitem__("MISSING_KEY_FOR_YKCOM_TESTS")]
+
+
+def test_retention_applies_to_the_spies() -> None:
+    with ykcom("tests.packages_for_testing.p4", "json", spy=True, retain="repr(12)") as mocked:
+        p4.json.dumps(list(range(100)))
+
+        assert repr(mocked.mock_calls) == "[call.json.dumps([0, 1, 2,...)]"
+        assert mocked.mock_calls == [call.json.dumps(list(range(100)))]
+
+
+def test_conversions_are_not_recorded() -> None:
+    with ykcom("tests.packages_for_testing.p1", "os", spy=True) as mocked:
+        environ = p1.os.environ
+
+        assert bool(environ) is bool(os.environ)
+        assert len(environ) == len(os.environ)
+        assert str(environ) == str(os.environ)
+        assert "PATH" in environ
+
+        assert mocked.mock_calls == [call.os.environ.__contains__("PATH")]
+
+
+def test_children_are_compared_by_identity(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(_self: p4.Client, _other: object) -> bool:
+        raise ValueError("The truth value of an array is ambiguous")
+
+    monkeypatch.setattr(p4.Client, "__eq__", fail)
+    monkeypatch.setattr(p4.Client, "__ne__", fail)
+    monkeypatch.setattr(p4.client_a, "peer", p4.client_b, raising=False)
+
+    with ykcom("tests.packages_for_testing.p4", "client_a", spy=True) as mocked:
+        peer = p4.client_a.peer
+        assert p4.client_a.peer is peer
+        assert p4.client_a.fetch is p4.client_a.fetch
+
+        p4.client_a.peer = p4.other
+        p4.client_a.peer.fetch("KEY")
+
+        assert mocked.mock_calls == [call.client_a.peer.fetch("KEY")]